@@ -88,6 +88,8 @@ FACTIONS = {
 }
 
 # --- Расширенные достижения ---
+# condition - правило выдачи (см. systems/achievements.py): {"stat"|"count"|"skill"|
+# "faction_reputation": ключ, "min"/"max": порог} или список таких правил (все сразу)
 ACHIEVEMENTS = {
     # Сюжетные достижения
     "first_hack": {
@@ -97,7 +99,8 @@ ACHIEVEMENTS = {
         "reward_btc": 10,
         "icon": "🎯",
         "rarity": "common",
-        "hidden": False
+        "hidden": False,
+        "condition": {"count": "completed_missions", "min": 1}
     },
     "story_complete": {
         "name": "Легенда даркнета",
@@ -106,7 +109,8 @@ ACHIEVEMENTS = {
         "reward_btc": 1000,
         "icon": "👑",
         "rarity": "legendary",
-        "hidden": False
+        "hidden": False,
+        "condition": {"stat": "story_stage", "min": 4}
     },
 
     # Экономические достижения
@@ -117,7 +121,8 @@ ACHIEVEMENTS = {
         "reward_items": ["golden_wallet"],
         "icon": "💰",
         "rarity": "epic",
-        "hidden": False
+        "hidden": False,
+        "condition": {"stat": "btc_balance", "min": 10000}
     },
     "market_manipulator": {
         "name": "Манипулятор рынка",
@@ -134,7 +139,8 @@ ACHIEVEMENTS = {
         "reward_rep": 15,
         "icon": "🏦",
         "rarity": "uncommon",
-        "hidden": True
+        "hidden": True,
+        "condition": [{"stat": "usd_balance", "min": 100000}, {"stat": "usd_spent", "max": 0}]
     },
 
     # Технические достижения
@@ -145,7 +151,8 @@ ACHIEVEMENTS = {
         "reward_items": ["ghost_cloak"],
         "icon": "👻",
         "rarity": "epic",
-        "hidden": False
+        "hidden": False,
+        "condition": {"stat": "missions_without_warnings", "min": 10}
     },
     "zero_day_hunter": {
         "name": "Охотник за Zero-Day",
@@ -174,7 +181,8 @@ ACHIEVEMENTS = {
         "reward_contacts": ["forum_admin"],
         "icon": "🏆",
         "rarity": "legendary",
-        "hidden": False
+        "hidden": False,
+        "condition": {"stat": "reputation", "min": 500}
     },
     "connection_master": {
         "name": "Мастер связей",
@@ -183,7 +191,8 @@ ACHIEVEMENTS = {
         "reward_items": ["contact_enhancer"],
         "icon": "🕸️",
         "rarity": "rare",
-        "hidden": False
+        "hidden": False,
+        "condition": {"count": "contacts", "min": 15}
     },
     "social_engineer": {
         "name": "Инженер душ",
@@ -192,7 +201,8 @@ ACHIEVEMENTS = {
         "reward_skills": {"social_eng": 2},
         "icon": "🎭",
         "rarity": "rare",
-        "hidden": False
+        "hidden": False,
+        "condition": {"skill": "social_eng", "min": 10}
     },
 
     # Фракционные достижения
@@ -204,7 +214,8 @@ ACHIEVEMENTS = {
         "icon": "🛡️",
         "rarity": "epic",
         "hidden": False,
-        "req_faction": "whitehats"
+        "req_faction": "whitehats",
+        "condition": {"faction_reputation": "whitehats", "min": 100}
     },
     "dark_lord": {
         "name": "Повелитель тьмы",
@@ -214,7 +225,8 @@ ACHIEVEMENTS = {
         "icon": "☠️",
         "rarity": "epic",
         "hidden": False,
-        "req_faction": "blackhats"
+        "req_faction": "blackhats",
+        "condition": {"faction_reputation": "blackhats", "min": 100}
     },
     "gray_eminence": {
         "name": "Серая минеция",
@@ -224,7 +236,8 @@ ACHIEVEMENTS = {
         "icon": "⚖️",
         "rarity": "epic",
         "hidden": False,
-        "req_faction": "grayhats"
+        "req_faction": "grayhats",
+        "condition": {"faction_reputation": "grayhats", "min": 100}
     },
     "faction_traitor": {
         "name": "Предатель",
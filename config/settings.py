@@ -70,7 +70,15 @@ GAME_SETTINGS = {
     'max_warnings': 3,
     'max_heat_level': 100,
     'event_check_frequency': 3,  # Проверка событий каждые N ходов
-    'autosave_frequency': 10     # Автосохранение каждые N ходов
+    'autosave_frequency': 10,    # Автосохранение каждые N ходов
+    'save_mode': 'snapshot',     # snapshot - полный снимок, journal - журнал дельт
+    'save_format': 'json',       # json - читаемый, binary - компактный бинарный формат
+    'journal_compact_every': 200,  # Полный снимок каждые N записей журнала
+    'save_backend': 'file',     # file - файлы сохранений, sqlite - база со слотами
+    'save_db': 'xss_saves.db',  # Файл базы для save_backend = sqlite
+    'save_slot': 'main',        # Слот по умолчанию
+    'event_profiling': False,   # Замер задержек слушателей событий (команда event_stats)
+    'network_world_size': 0     # Узлов процедурной сети (0 - только базовая сеть)
 }
 
 # Начальное состояние игрока
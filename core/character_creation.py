@@ -2,7 +2,6 @@
 Система создания персонажа для XSS Game 0.3.0
 """
 
-import random
 import re
 import time
 from typing import Dict, List, Optional, Tuple
@@ -11,6 +10,9 @@ from ui.colors import XSSColors as Colors
 from ui.effects import typing_effect, show_ascii_art, boxed_text, progress_bar
 from core.game_state import game_state
 from systems.audio import audio_system
+from core.replay import rng_stream
+
+random = rng_stream("character_creation")
 
 
 class CharacterCreator:
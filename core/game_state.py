@@ -4,31 +4,131 @@
 
 import json
 import os
+import shutil
+import sqlite3
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional
-
-from config.settings import INITIAL_PLAYER_STATE, GAME_SETTINGS
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from config.settings import GAME_SETTINGS
+from core.player_stats import PlayerStats
+from core.save_journal import SaveJournal
+from core.save_json import CachedJSON, GameJSONEncoder, dump_json, encode_json
+from core.save_store import SaveStore, open_store
+from core.session import session_system, current_session
+from core import save_format
 from ui.colors import XSSColors  # Изменено с Colors на XSSColors
 
 
 class GameState:
     """Класс для управления состоянием игры"""
 
-    def __init__(self):
-        self.player_stats = INITIAL_PLAYER_STATE.copy()
-        self._initialize_nested_dicts()
-
-    def _initialize_nested_dicts(self):
-        """Инициализирует вложенные словари если они отсутствуют"""
-        if 'skills' not in self.player_stats:
-            self.player_stats['skills'] = INITIAL_PLAYER_STATE['skills'].copy()
-        if 'story_choices' not in self.player_stats:
-            self.player_stats['story_choices'] = {}
-        # Добавляем поля для сетевой системы
-        if 'current_node' not in self.player_stats:
-            self.player_stats['current_node'] = 'localhost'
-        if 'network_nodes' not in self.player_stats:
-            self.player_stats['network_nodes'] = {}
+    def __init__(self, save_file: Optional[str] = None, profile: str = "default"):
+        self.save_file = save_file or GAME_SETTINGS['save_file']
+        self.profile = profile
+        self.save_slot = GAME_SETTINGS.get('save_slot', 'main')
+        self.player_stats = PlayerStats.from_dict()
+
+        # Индексы-множества для списков player_stats: ключ -> [список, длина, множество]
+        self._membership: Dict[str, list] = {}
+
+        # Поколение изменений и закодированная статистика для него
+        self.generation = 0
+        self._stats_fragment: Optional[Tuple[int, CachedJSON]] = None
+
+        # Блокировка записи файлов (фоновое автосохранение и ручные сохранения)
+        self.save_lock = threading.RLock()
+
+        # Хранилище слотов для save_backend = 'sqlite'
+        self.save_store: Optional[SaveStore] = None
+        if GAME_SETTINGS.get('save_backend') == 'sqlite':
+            self.save_store = open_store(GAME_SETTINGS['save_db'])
+
+        # Дополнительные секции хранилища: имя -> (сбор данных, восстановление)
+        self.save_sections: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {}
+        self._unrestored_sections: Dict[str, Any] = {}
+
+        # Загруженное состояние сети, пока сеть еще не построена (см. systems/network.py)
+        self._unloaded_network_state: Optional[Dict[str, Any]] = None
+
+        # Подписчики на изменения: callback(op, key, value), см. _record_change
+        self._change_listeners: List[Callable[[str, str, Any], None]] = []
+
+        # Вызываются перед сохранением на основном потоке (см. systems/autosave.py)
+        self._save_barriers: List[Callable[[], Any]] = []
+
+        # Журнал дельт для режима сохранения 'journal' (только для файлов)
+        self.journal: Optional[SaveJournal] = None
+        if GAME_SETTINGS.get('save_mode') == 'journal' and self.save_store is None:
+            self.journal = SaveJournal(self.save_file, GAME_SETTINGS['journal_compact_every'])
+
+    def _record_change(self, op: str, key: str, value: Any = None) -> None:
+        """Отмечает изменение состояния и записывает его в журнал, если он включен"""
+        self.generation += 1
+        if self.journal is not None:
+            self.journal.record(op, key, value)
+        for listener in self._change_listeners:
+            listener(op, key, value)
+
+    def add_change_listener(self, listener: Callable[[str, str, Any], None]) -> None:
+        """Подписка на изменения состояния. После загрузки сохранения приходит op='load'"""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def add_save_barrier(self, barrier: Callable[[], Any]) -> None:
+        """Регистрирует вызов, который выполняется перед каждым save_game"""
+        if barrier not in self._save_barriers:
+            self._save_barriers.append(barrier)
+
+    def _member_index(self, key: str) -> Set[Any]:
+        """Множество для O(1) проверки принадлежности списку player_stats[key]
+
+        Сам список остается источником истины для сохранений и порядка.
+        Индекс перестраивается, если список заменили (загрузка, set_stat)
+        или изменили в обход API.
+        """
+        items = self.player_stats.get(key)
+        if items is None:
+            return set()
+
+        cached = self._membership.get(key)
+        if cached is not None and cached[0] is items and cached[1] == len(items):
+            return cached[2]
+
+        index = set(items)
+        self._membership[key] = [items, len(items), index]
+        return index
+
+    def _add_member(self, key: str, value: Any) -> bool:
+        """Добавляет значение в список player_stats[key] без дубликатов"""
+        if key not in self.player_stats:
+            self.player_stats[key] = []
+
+        index = self._member_index(key)
+        if value in index:
+            return False
+
+        items = self.player_stats[key]
+        items.append(value)
+        index.add(value)
+        self._membership[key][1] = len(items)
+        self._record_change("add", key, value)
+        return True
+
+    def _remove_member(self, key: str, value: Any) -> bool:
+        """Удаляет значение из списка player_stats[key]"""
+        index = self._member_index(key)
+        if value not in index:
+            return False
+
+        items = self.player_stats[key]
+        items.remove(value)
+        # В старых сохранениях список мог содержать дубликаты
+        if value not in items:
+            index.discard(value)
+        self._membership[key][1] = len(items)
+        self._record_change("remove", key, value)
+        return True
 
     def get_stat(self, key: str, default: Any = None) -> Any:
         """Получить статистику игрока"""
@@ -37,6 +137,7 @@ class GameState:
     def set_stat(self, key: str, value: Any) -> None:
         """Установить статистику игрока"""
         self.player_stats[key] = value
+        self._record_change("set", key, value)
 
     def modify_stat(self, key: str, change: float) -> float:
         """Изменить статистику на указанное значение"""
@@ -47,13 +148,13 @@ class GameState:
 
     def get_skill(self, skill: str) -> int:
         """Получить уровень навыка"""
-        return self.player_stats.get('skills', {}).get(skill, 0)
+        return self.player_stats.skills.get(skill, 0)
 
     def set_skill(self, skill: str, level: int) -> None:
         """Установить уровень навыка"""
-        if 'skills' not in self.player_stats:
-            self.player_stats['skills'] = {}
-        self.player_stats['skills'][skill] = max(0, min(10, level))
+        level = max(0, min(10, level))
+        self.player_stats.skills[skill] = level
+        self._record_change("skill", skill, level)
 
     def modify_skill(self, skill: str, change: int) -> int:
         """Изменить навык на указанное значение"""
@@ -64,46 +165,27 @@ class GameState:
 
     def add_to_inventory(self, item_id: str) -> bool:
         """Добавить предмет в инвентарь"""
-        if 'inventory' not in self.player_stats:
-            self.player_stats['inventory'] = []
-
-        if item_id not in self.player_stats['inventory']:
-            self.player_stats['inventory'].append(item_id)
-            return True
-        return False
+        return self._add_member('inventory', item_id)
 
     def remove_from_inventory(self, item_id: str) -> bool:
         """Удалить предмет из инвентаря"""
-        if 'inventory' in self.player_stats and item_id in self.player_stats['inventory']:
-            self.player_stats['inventory'].remove(item_id)
-            return True
-        return False
+        return self._remove_member('inventory', item_id)
 
     def has_item(self, item_id: str) -> bool:
         """Проверить наличие предмета в инвентаре"""
-        return item_id in self.player_stats.get('inventory', [])
+        return item_id in self._member_index('inventory')
 
     def add_contact(self, contact_id: str) -> bool:
         """Добавить контакт"""
-        if 'contacts' not in self.player_stats:
-            self.player_stats['contacts'] = []
-
-        if contact_id not in self.player_stats['contacts']:
-            self.player_stats['contacts'].append(contact_id)
-            return True
-        return False
+        return self._add_member('contacts', contact_id)
 
     def has_contact(self, contact_id: str) -> bool:
         """Проверить наличие контакта"""
-        return contact_id in self.player_stats.get('contacts', [])
+        return contact_id in self._member_index('contacts')
 
     def complete_mission(self, mission_id: str) -> None:
         """Отметить миссию как выполненную"""
-        if 'completed_missions' not in self.player_stats:
-            self.player_stats['completed_missions'] = []
-
-        if mission_id not in self.player_stats['completed_missions']:
-            self.player_stats['completed_missions'].append(mission_id)
+        self._add_member('completed_missions', mission_id)
 
     def decay_heat_level(self) -> None:
         """Постепенное снижение heat level со временем"""
@@ -116,35 +198,28 @@ class GameState:
 
     def is_mission_completed(self, mission_id: str) -> bool:
         """Проверить выполнена ли миссия"""
-        return mission_id in self.player_stats.get('completed_missions', [])
+        return mission_id in self._member_index('completed_missions')
 
     def add_achievement(self, achievement_id: str) -> bool:
         """Добавить достижение"""
-        if 'achievements' not in self.player_stats:
-            self.player_stats['achievements'] = []
-
-        if achievement_id not in self.player_stats['achievements']:
-            self.player_stats['achievements'].append(achievement_id)
-            return True
-        return False
+        return self._add_member('achievements', achievement_id)
 
     def has_achievement(self, achievement_id: str) -> bool:
         """Проверить наличие достижения"""
-        return achievement_id in self.player_stats.get('achievements', [])
+        return achievement_id in self._member_index('achievements')
 
     def set_story_choice(self, choice_key: str, value: Any) -> None:
         """Сохранить выбор в сюжете"""
-        if 'story_choices' not in self.player_stats:
-            self.player_stats['story_choices'] = {}
-        self.player_stats['story_choices'][choice_key] = value
+        self.player_stats.story_choices[choice_key] = value
+        self._record_change("story", choice_key, value)
 
     def get_story_choice(self, choice_key: str, default: Any = None) -> Any:
         """Получить выбор в сюжете"""
-        return self.player_stats.get('story_choices', {}).get(choice_key, default)
+        return self.player_stats.story_choices.get(choice_key, default)
 
     def update_last_seen(self) -> None:
         """Обновить время последнего визита"""
-        self.player_stats['last_seen'] = datetime.now().strftime("%H:%M")
+        self.set_stat('last_seen', datetime.now().strftime("%H:%M"))
 
     def increment_turn(self) -> int:
         """Увеличить счетчик ходов"""
@@ -171,35 +246,77 @@ class GameState:
         current = self.get_stat(currency, 0)
         self.set_stat(currency, current + amount)
 
-    def save_game(self, filename: Optional[str] = None) -> bool:
-        """Сохранить игру с улучшенной обработкой ошибок"""
-        filename = filename or GAME_SETTINGS['save_file']
+    def mark_dirty(self) -> None:
+        """Отметить изменение, сделанное в обход API (например, во вложенном списке)"""
+        self.generation += 1
+
+    def stats_fragment(self) -> CachedJSON:
+        """Статистика игрока в JSON; кодируется заново только после изменений"""
+        cached = self._stats_fragment
+        if cached is None or cached[0] != self.generation:
+            cached = (self.generation, CachedJSON.encode(self.player_stats))
+            self._stats_fragment = cached
+        return cached[1]
+
+    def build_save_data(self, cached: Optional[bool] = None) -> Dict[str, Any]:
+        """Собрать данные для сохранения (ссылается на живое состояние)
+
+        cached - использовать готовые JSON-фрагменты неизменившихся секций;
+        по умолчанию включено для формата json.
+        """
+        if cached is None:
+            cached = GAME_SETTINGS.get('save_format') != 'binary'
+
+        save_data = {
+            "player_stats": self.stats_fragment() if cached else self.player_stats,
+            "save_timestamp": datetime.now().isoformat(),
+            "game_version": "0.3.8"
+        }
 
+        # Сохраняем состояние сети с обработкой ошибок
         try:
-            save_data = {
-                "player_stats": self.player_stats,
-                "save_timestamp": datetime.now().isoformat(),
-                "game_version": "0.3.8"
-            }
-
-            # Сохраняем состояние сети с обработкой ошибок
-            try:
-                from systems.network import network_system
-                network_state = network_system.save_network_state()
+            network_state = self._network_state(cached)
+            if network_state is not None:
                 save_data["network_state"] = network_state
-            except ImportError:
-                print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Модуль network недоступен{XSSColors.RESET}")
-                pass
-            except Exception as e:
-                print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Не удалось сохранить состояние сети: {e}{XSSColors.RESET}")
-                # Продолжаем сохранение без сетевого состояния
-                pass
-
+        except ImportError:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Модуль network недоступен{XSSColors.RESET}")
+        except Exception as e:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Не удалось сохранить состояние сети: {e}{XSSColors.RESET}")
+            # Продолжаем сохранение без сетевого состояния
+
+        return save_data
+
+    def _network_state(self, cached: bool = False) -> Optional[Dict[str, Any]]:
+        """Состояние сети для сохранения.
+
+        Если сеть в этой сессии не строилась, ее не создаем: пишем обратно
+        загруженное состояние как есть (или ничего для новой игры).
+        """
+        from core.session import is_created
+        from systems.network import network_system
+        if not is_created(network_system):
+            return self._unloaded_network_state
+        return network_system.save_network_state(cached=cached)
+
+    def flush_journal(self) -> None:
+        """Дописать дельты в журнал и обновить файл состояния сети"""
+        self.journal.flush()
+        network_state = self._network_state(cached=True)
+        if network_state is not None:
+            self.journal.write_network(encode_json(network_state))
+
+    def take_network_state(self) -> Optional[Dict[str, Any]]:
+        """Забрать отложенное состояние сети (вызывается при построении сети)"""
+        state, self._unloaded_network_state = self._unloaded_network_state, None
+        return state
+
+    def write_save_data(self, save_data: Dict[str, Any], filename: str) -> None:
+        """Атомарно записать данные сохранения (безопасно из фонового потока)"""
+        with self.save_lock:
             # Создаем резервную копию если файл существует
             if os.path.exists(filename):
                 try:
                     backup_name = f"{filename}.backup"
-                    import shutil
                     shutil.copy2(filename, backup_name)
                 except Exception as e:
                     print(
@@ -208,22 +325,12 @@ class GameState:
             # Сохраняем во временный файл, затем переименовываем (атомарность)
             temp_filename = f"{filename}.tmp"
 
-            # Используем custom JSON encoder для обработки сложных объектов
-            import json
-
-            class GameJSONEncoder(json.JSONEncoder):
-                def default(self, obj):
-                    # Если объект имеет метод to_dict, используем его
-                    if hasattr(obj, 'to_dict') and callable(getattr(obj, 'to_dict')):
-                        return obj.to_dict()
-                    # Для других неподдерживаемых объектов возвращаем строковое представление
-                    try:
-                        return super().default(obj)
-                    except TypeError:
-                        return str(obj)
-
-            with open(temp_filename, "w", encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2, cls=GameJSONEncoder)
+            if GAME_SETTINGS.get('save_format') == 'binary':
+                save_format.write_file(temp_filename, save_data)
+            else:
+                # Неизменившиеся секции вставляются готовыми фрагментами
+                with open(temp_filename, "w", encoding='utf-8') as f:
+                    dump_json(save_data, f)
 
             # Атомарное переименование
             if os.name == 'nt':  # Windows
@@ -231,6 +338,83 @@ class GameState:
                     os.remove(filename)
             os.rename(temp_filename, filename)
 
+    def register_save_section(self, name: str, collect: Callable[[], Any], restore: Callable[[Any], None]) -> None:
+        """Регистрирует секцию, которая пишется в хранилище вместе с основным состоянием"""
+        self.save_sections[name] = (collect, restore)
+
+        # Слот мог быть загружен раньше, чем система зарегистрировалась
+        if name in self._unrestored_sections:
+            restore(self._unrestored_sections.pop(name))
+
+    def build_store_sections(self) -> Dict[str, Any]:
+        """Собрать все секции слота хранилища"""
+        sections = {"game": self.build_save_data(cached=False)}
+        for name, (collect, _) in self.save_sections.items():
+            try:
+                sections[name] = collect()
+            except Exception as e:
+                print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Секция {name} не сохранена: {e}{XSSColors.RESET}")
+        return sections
+
+    def write_store_sections(self, sections: Dict[str, Any], slot: Optional[str] = None) -> None:
+        """Записать секции в слот одной транзакцией (безопасно из фонового потока)"""
+        with self.save_lock:
+            self.save_store.save_slot(self.profile, slot or self.save_slot, sections)
+
+    def has_saved_game(self, slot: Optional[str] = None) -> bool:
+        """Есть ли сохранение для загрузки"""
+        if self.save_store is not None:
+            return self.save_store.has_slot(self.profile, slot or self.save_slot)
+        return os.path.exists(self.save_file)
+
+    def list_saves(self) -> List[Dict[str, Any]]:
+        """Метаданные слотов профиля (без чтения самих сохранений)"""
+        if self.save_store is None:
+            return []
+        return self.save_store.list_slots(self.profile)
+
+    def _save_to_store(self, slot: Optional[str] = None) -> bool:
+        """Сохранить игру в слот хранилища"""
+        slot = slot or self.save_slot
+        try:
+            self.write_store_sections(self.build_store_sections(), slot)
+            self.save_slot = slot
+            print(f"{XSSColors.SUCCESS}[СИСТЕМА] Игра сохранена в слот {slot}!{XSSColors.RESET}")
+            return True
+        except sqlite3.Error as e:
+            print(f"{XSSColors.ERROR}[ОШИБКА] Не удалось сохранить игру в базу: {e}{XSSColors.RESET}")
+            return False
+
+    def save_game(self, filename: Optional[str] = None, compact: bool = False, slot: Optional[str] = None) -> bool:
+        """Сохранить игру с улучшенной обработкой ошибок"""
+        # Старый снимок фоновой записи не должен лечь поверх этого сохранения
+        for barrier in self._save_barriers:
+            barrier()
+
+        # Явно указанный файл (аварийное сохранение) всегда пишется в файл
+        if self.save_store is not None and filename is None:
+            return self._save_to_store(slot)
+
+        filename = filename or self.save_file
+
+        # В режиме журнала дописываем только дельты, пока не пришло время снимка
+        journaled = self.journal is not None and filename == self.journal.snapshot_filename
+        if journaled and not compact and not self.journal.should_compact():
+            try:
+                self.flush_journal()
+                print(f"{XSSColors.SUCCESS}[СИСТЕМА] Игра сохранена успешно!{XSSColors.RESET}")
+                return True
+            except Exception as e:
+                print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Журнал недоступен, полное сохранение: {e}{XSSColors.RESET}")
+
+        try:
+            save_data = self.build_save_data()
+            self.write_save_data(save_data, filename)
+
+            # Снимок содержит все изменения - журнал начинается заново
+            if journaled:
+                self.journal.reset()
+
             print(f"{XSSColors.SUCCESS}[СИСТЕМА] Игра сохранена успешно!{XSSColors.RESET}")
             return True
 
@@ -246,7 +430,7 @@ class GameState:
             # Попытка упрощенного сохранения только основных данных игрока
             try:
                 simple_save_data = {
-                    "player_stats": self.player_stats,
+                    "player_stats": self.player_stats.to_dict(),
                     "save_timestamp": datetime.now().isoformat(),
                     "game_version": "0.3.8"
                 }
@@ -262,9 +446,83 @@ class GameState:
                     f"{XSSColors.ERROR}[КРИТИЧНО] Упрощенное сохранение тоже не удалось: {simple_error}{XSSColors.RESET}")
                 return False
 
-    def load_game(self, filename: Optional[str] = None) -> bool:
+    def _apply_save_data(self, save_data: Dict[str, Any]) -> None:
+        """Применить загруженные данные сохранения"""
+        # Проверяем версию сохранения
+        saved_version = save_data.get("game_version", "unknown")
+        if saved_version not in ["0.3.0", "0.3.1", "0.3.8"]:
+            print(f"{XSSColors.WARNING}[СИСТЕМА] Сохранение от другой версии: {saved_version}{XSSColors.RESET}")
+
+        # Загружаем данные с проверкой целостности
+        loaded_stats = save_data.get("player_stats", {})
+
+        # Объединяем с базовым состоянием чтобы добавить новые поля
+        # (недостающие навыки и сетевые поля заполняет PlayerStats)
+        self.player_stats = PlayerStats.from_dict(loaded_stats)
+        self._membership.clear()
+        self.mark_dirty()
+
+        # Загружаем состояние сети если есть
+        if "network_state" in save_data:
+            self._apply_network_state(save_data["network_state"])
+
+    def _notify_loaded(self) -> None:
+        """Сообщает подписчикам о загрузке, когда состояние восстановлено полностью"""
+        for listener in self._change_listeners:
+            listener("load", "*", None)
+
+    def _apply_network_state(self, network_state: Dict[str, Any]) -> None:
+        """Применить загруженное состояние сети"""
+        try:
+            from core.session import is_created
+            from systems.network import network_system
+            if is_created(network_system):
+                network_system.load_network_state(network_state)
+            else:
+                # Сеть построится при первой сетевой команде и заберет состояние
+                self._unloaded_network_state = network_state
+        except ImportError:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Модуль network недоступен{XSSColors.RESET}")
+        except Exception as e:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка загрузки сети: {e}{XSSColors.RESET}")
+
+    def _load_from_store(self, slot: Optional[str] = None) -> bool:
+        """Загрузить игру из слота хранилища"""
+        slot = slot or self.save_slot
+        try:
+            sections = self.save_store.load_slot(self.profile, slot)
+        except (sqlite3.Error, save_format.SaveFormatError) as e:
+            print(f"{XSSColors.ERROR}[ОШИБКА] Не удалось загрузить игру: {e}{XSSColors.RESET}")
+            return False
+
+        if not sections or "game" not in sections:
+            print(f"{XSSColors.WARNING}[СИСТЕМА] Сохранение в слоте {slot} не найдено{XSSColors.RESET}")
+            return False
+
+        self._apply_save_data(sections.pop("game"))
+
+        self._unrestored_sections = {}
+        for name, data in sections.items():
+            handler = self.save_sections.get(name)
+            if handler is None:
+                self._unrestored_sections[name] = data
+                continue
+            try:
+                handler[1](data)
+            except Exception as e:
+                print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Секция {name} не загружена: {e}{XSSColors.RESET}")
+
+        self.save_slot = slot
+        self._notify_loaded()
+        print(f"{XSSColors.SUCCESS}[СИСТЕМА] Игра загружена из слота {slot}!{XSSColors.RESET}")
+        return True
+
+    def load_game(self, filename: Optional[str] = None, slot: Optional[str] = None) -> bool:
         """Загрузить игру"""
-        filename = filename or GAME_SETTINGS['save_file']
+        if self.save_store is not None and filename is None:
+            return self._load_from_store(slot)
+
+        filename = filename or self.save_file
 
         try:
             if not os.path.exists(filename):
@@ -277,42 +535,27 @@ class GameState:
                     print(f"{XSSColors.WARNING}[СИСТЕМА] Сохранение не найдено{XSSColors.RESET}")
                     return False
 
-            with open(filename, "r", encoding='utf-8') as f:
-                save_data = json.load(f)
-
-            # Проверяем версию сохранения
-            saved_version = save_data.get("game_version", "unknown")
-            if saved_version not in ["0.3.0", "0.3.1", "0.3.8"]:
-                print(f"{XSSColors.WARNING}[СИСТЕМА] Сохранение от другой версии: {saved_version}{XSSColors.RESET}")
-
-            # Загружаем данные с проверкой целостности
-            loaded_stats = save_data.get("player_stats", {})
-
-            # Объединяем с базовым состоянием чтобы добавить новые поля
-            self.player_stats = INITIAL_PLAYER_STATE.copy()
-            self.player_stats.update(loaded_stats)
-
-            # Убеждаемся что все навыки существуют
-            for skill in INITIAL_PLAYER_STATE['skills']:
-                if skill not in self.player_stats['skills']:
-                    self.player_stats['skills'][skill] = 1
-
-            # Добавляем новые поля если их нет
-            if 'current_node' not in self.player_stats:
-                self.player_stats['current_node'] = 'localhost'
-            if 'network_nodes' not in self.player_stats:
-                self.player_stats['network_nodes'] = {}
-
-            # Загружаем состояние сети если есть
-            if "network_state" in save_data:
-                try:
-                    from systems.network import network_system
-                    network_system.load_network_state(save_data["network_state"])
-                except ImportError:
-                    print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Модуль network недоступен{XSSColors.RESET}")
-                except Exception as e:
-                    print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка загрузки сети: {e}{XSSColors.RESET}")
+            # Формат определяется по заголовку файла, а не по настройкам
+            if save_format.is_binary_file(filename):
+                save_data = save_format.read_file(filename)
+            else:
+                with open(filename, "r", encoding='utf-8') as f:
+                    save_data = json.load(f)
+
+            self._apply_save_data(save_data)
+
+            # Доигрываем хвост журнала поверх снимка
+            if self.journal is not None:
+                if filename == self.journal.snapshot_filename:
+                    self.journal.replay(self.player_stats)
+                    network_state = self.journal.read_network()
+                    if network_state is not None:
+                        self._apply_network_state(network_state)
+                else:
+                    self.journal.discard_pending()
 
+            # После хвоста журнала и состояния сети
+            self._notify_loaded()
             print(f"{XSSColors.SUCCESS}[СИСТЕМА] Игра загружена успешно!{XSSColors.RESET}")
             return True
 
@@ -320,27 +563,51 @@ class GameState:
             print(f"{XSSColors.ERROR}[ОШИБКА] Не удалось загрузить игру: {e}{XSSColors.RESET}")
             return False
 
+    def export_game(self, filename: str) -> bool:
+        """Экспортировать текущее состояние в читаемый JSON"""
+        export_data = {
+            "player_stats": self.player_stats,
+            "save_timestamp": datetime.now().isoformat(),
+            "game_version": "0.3.8"
+        }
+
+        try:
+            network_state = self._network_state()
+            if network_state is not None:
+                export_data["network_state"] = network_state
+        except Exception as e:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Состояние сети не экспортировано: {e}{XSSColors.RESET}")
+
+        try:
+            with open(filename, "w", encoding='utf-8') as f:
+                json.dump(export_data, f, ensure_ascii=False, indent=2, cls=GameJSONEncoder)
+            print(f"{XSSColors.SUCCESS}[СИСТЕМА] Состояние экспортировано в {filename}{XSSColors.RESET}")
+            return True
+        except OSError as e:
+            print(f"{XSSColors.ERROR}[ОШИБКА] Не удалось экспортировать игру: {e}{XSSColors.RESET}")
+            return False
+
     def reset_game(self) -> None:
         """Сбросить игру к начальному состоянию"""
-        self.player_stats = INITIAL_PLAYER_STATE.copy()
-        self._initialize_nested_dicts()
+        self.player_stats = PlayerStats.from_dict()
+        self._membership.clear()
+        self._unloaded_network_state = None
+        self.mark_dirty()
+        if self.journal is not None:
+            self.journal.discard_pending()
         print(f"{XSSColors.WARNING}[СИСТЕМА] Игра сброшена к начальному состоянию{XSSColors.RESET}")
 
     def get_portfolio_value(self, crypto_prices: Dict[str, float]) -> float:
         """Получить общую стоимость портфеля"""
-        total_value = self.get_stat('usd_balance', 0)
-
-        # Добавляем BTC
-        btc_value = self.get_stat('btc_balance', 0) * crypto_prices.get('BTC', 0)
-        total_value += btc_value
-
-        # Добавляем другие криптовалюты
-        for symbol in ['ETH', 'LTC', 'XRP', 'DOGE']:
-            amount = self.get_stat(symbol, 0)
-            price = crypto_prices.get(symbol, 0)
-            total_value += amount * price
-
-        return total_value
+        stats = self.player_stats
+        return (
+            stats.usd_balance
+            + stats.btc_balance * crypto_prices.get('BTC', 0)
+            + stats.ETH * crypto_prices.get('ETH', 0)
+            + stats.LTC * crypto_prices.get('LTC', 0)
+            + stats.XRP * crypto_prices.get('XRP', 0)
+            + stats.DOGE * crypto_prices.get('DOGE', 0)
+        )
 
     def get_summary(self) -> Dict[str, Any]:
         """Получить краткую сводку состояния"""
@@ -360,5 +627,8 @@ class GameState:
         }
 
 
-# Глобальный экземпляр состояния игры
-game_state = GameState()
\ No newline at end of file
+# Состояние игры текущей сессии (см. core/session.py)
+game_state = session_system(
+    "game_state",
+    lambda: GameState(current_session().save_file, current_session().session_id)
+)
\ No newline at end of file
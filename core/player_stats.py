@@ -0,0 +1,193 @@
+"""
+Компактное представление статистики игрока на __slots__
+"""
+
+import copy
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import INITIAL_PLAYER_STATE
+
+
+class SlottedStats:
+    """Базовый класс: фиксированные поля в слотах + словарь для прочих ключей.
+
+    Поддерживает словарный интерфейс (get, [], in, setdefault, update), поэтому
+    get_stat/set_stat и журнал сохранений работают с ним как с dict.
+    """
+
+    __slots__ = ("_extra",)
+
+    FIELDS: tuple = ()
+    _FIELD_SET: frozenset = frozenset()
+    _get_fields = staticmethod(lambda obj: ())
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELDS = tuple(cls.__slots__)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        cls._get_fields = staticmethod(attrgetter(*cls.FIELDS))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._FIELD_SET:
+            raise KeyError(f"Поле {key} нельзя удалить")
+        del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELD_SET or key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + len(self._extra)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SlottedStats):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        return self._extra.get(key, default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        return self._extra.setdefault(key, default)
+
+    def update(self, other: Any = (), **kwargs) -> None:
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def keys(self) -> List[str]:
+        return list(self)
+
+    def values(self) -> List[Any]:
+        return [self[key] for key in self]
+
+    def items(self) -> List[tuple]:
+        return list(zip(self.keys(), self.values()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Словарь для сохранения (контейнеры не копируются)"""
+        result = dict(zip(self.FIELDS, self._get_fields(self)))
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+
+class Skills(SlottedStats):
+    """Навыки игрока"""
+
+    __slots__ = ("scanning", "cracking", "stealth", "social_eng")
+
+    def __init__(self, scanning: int = 1, cracking: int = 1, stealth: int = 1, social_eng: int = 1):
+        self._extra: Dict[str, Any] = {}
+        self.scanning = scanning
+        self.cracking = cracking
+        self.stealth = stealth
+        self.social_eng = social_eng
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]] = None) -> "Skills":
+        """Создает навыки; отсутствующие навыки получают уровень 1"""
+        skills = cls()
+        if data:
+            skills.update(data)
+        return skills
+
+
+class PlayerStats(SlottedStats):
+    """Статистика игрока с фиксированными полями.
+
+    Значения по умолчанию берутся из INITIAL_PLAYER_STATE; ключи, которых нет
+    среди полей (счетчики тренировок, флаги сюжета), хранятся в _extra.
+    """
+
+    __slots__ = (
+        # Балансы и криптовалюты портфеля
+        "usd_balance", "btc_balance", "ETH", "LTC", "XRP", "DOGE",
+        # Числовые показатели
+        "reputation", "heat_level", "warnings", "turn_number",
+        "story_stage", "mission_progress",
+        # Профиль и прогресс
+        "username", "join_date", "last_seen", "faction", "active_mission",
+        "skills", "inventory", "contacts", "completed_missions",
+        "achievements", "seen_items", "story_choices",
+        # Сеть
+        "current_node", "network_nodes",
+    )
+
+    def __init__(self):
+        self._extra: Dict[str, Any] = {}
+        self.usd_balance: float = 0.0
+        self.btc_balance: float = 0.0
+        self.ETH: float = 0.0
+        self.LTC: float = 0.0
+        self.XRP: float = 0.0
+        self.DOGE: float = 0.0
+        self.reputation: int = 0
+        self.heat_level: int = 0
+        self.warnings: int = 0
+        self.turn_number: int = 0
+        self.story_stage: int = 0
+        self.mission_progress: int = 0
+        self.username: str = "unknown"
+        self.join_date: str = ""
+        self.last_seen: str = ""
+        self.faction: Optional[str] = None
+        self.active_mission: Optional[str] = None
+        self.skills: Skills = Skills()
+        self.inventory: List[str] = []
+        self.contacts: List[str] = []
+        self.completed_missions: List[str] = []
+        self.achievements: List[str] = []
+        self.seen_items: List[str] = []
+        self.story_choices: Dict[str, Any] = {}
+        self.current_node: str = "localhost"
+        self.network_nodes: Dict[str, Any] = {}
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "skills" and not isinstance(value, Skills):
+            value = Skills.from_dict(value)
+        super().__setitem__(key, value)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key == "skills":
+            return self.skills
+        return super().setdefault(key, default)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]] = None) -> "PlayerStats":
+        """Начальное состояние, дополненное данными сохранения"""
+        stats = cls()
+        # Копия, чтобы списки и словари не делились между экземплярами
+        stats.update(copy.deepcopy(INITIAL_PLAYER_STATE))
+        if data:
+            stats.update(data)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = super().to_dict()
+        result["skills"] = self.skills.to_dict()
+        return result
@@ -0,0 +1,190 @@
+"""
+Запись и воспроизведение игровых сессий: ввод игрока, часы и потоки случайных чисел
+"""
+
+import builtins
+import json
+import random as _random
+import time
+from typing import Any, Dict, List, Optional
+
+TRACE_VERSION = 2
+
+# Потоки случайных чисел подсистем: имя -> генератор
+_streams: Dict[str, _random.Random] = {}
+_master_seed: Optional[int] = None
+
+
+def rng_stream(name: str) -> _random.Random:
+    """Собственный поток случайных чисел подсистемы.
+
+    У каждой подсистемы свой генератор, поэтому лишний вызов random в
+    одной из них (например, в визуальных эффектах) не сдвигает остальные.
+    Модуль подсистемы подменяет им модуль random на уровне модуля:
+    random = rng_stream("<подсистема>"). При записи и воспроизведении
+    сессии все потоки засеваются от общего зерна (seed_streams).
+    """
+    stream = _streams.get(name)
+    if stream is None:
+        stream = _random.Random()
+        if _master_seed is not None:
+            stream.seed(f"{_master_seed}:{name}")
+        _streams[name] = stream
+    return stream
+
+
+def seed_streams(seed: int) -> None:
+    """Задает начальное состояние всех потоков от общего зерна"""
+    global _master_seed
+    _master_seed = seed
+    for name, stream in _streams.items():
+        stream.seed(f"{seed}:{name}")
+
+
+class SessionRecorder:
+    """Записывает строки ввода игрока в трассу и воспроизводит их без игрока.
+
+    Перехватывается builtins.input, поэтому в трассу попадает весь ввод:
+    command_completer.get_enhanced_input, audio_system.get_input_with_sound
+    и подтверждения в меню подсистем.
+
+    time.time заменяется часами сессии: они переводятся на реальное время
+    в момент каждого ввода (оно пишется в трассу) и сдвигаются вызовами
+    time.sleep. При воспроизведении часы берут время из трассы, поэтому
+    таймеры миссий и мини-игр видят те же значения, что и при записи.
+    """
+
+    def __init__(self):
+        self.mode: Optional[str] = None  # None, "record" или "replay"
+        self.seed: Optional[int] = None
+        self.inputs_read = 0
+        self._trace_file = None
+        self._records: List[Dict[str, Any]] = []
+        self._position = 0
+        self._exit_sent = False
+        self._clock = 0.0
+        self._original_input = builtins.input
+        self._original_sleep = time.sleep
+        self._original_time = time.time
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    @property
+    def exhausted(self) -> bool:
+        """Трасса воспроизведена полностью"""
+        return self.mode == "replay" and self._position >= len(self._records)
+
+    def start_recording(self, path: str, seed: Optional[int] = None) -> int:
+        """Начинает запись сессии в файл трассы"""
+        self.seed = seed if seed is not None else _random.SystemRandom().randrange(2 ** 32)
+        seed_streams(self.seed)
+
+        self._clock = self._original_time()
+        self._trace_file = open(path, "w", encoding="utf-8")
+        self._write({"type": "header", "version": TRACE_VERSION, "seed": self.seed, "time": self._clock})
+
+        builtins.input = self.read_input
+        time.time = self.clock
+        time.sleep = self.sleep
+        self.mode = "record"
+        return self.seed
+
+    def start_replay(self, path: str) -> int:
+        """Загружает трассу и включает воспроизведение"""
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+        if not records or records[0].get("type") != "header":
+            raise ValueError(f"{path}: нет заголовка трассы")
+        if records[0].get("version", 0) > TRACE_VERSION:
+            raise ValueError(f"{path}: неподдерживаемая версия трассы")
+
+        self.seed = records[0]["seed"]
+        seed_streams(self.seed)
+        self._records = records[1:]
+        self._position = 0
+        self._exit_sent = False
+
+        builtins.input = self.read_input
+        time.sleep = self.sleep
+        # В трассах версии 1 времени нет - остаются настоящие часы
+        if "time" in records[0]:
+            self._clock = records[0]["time"]
+            time.time = self.clock
+        self.mode = "replay"
+        return self.seed
+
+    def clock(self) -> float:
+        """Замена time.time(): часы сессии"""
+        return self._clock
+
+    def sleep(self, seconds: float) -> None:
+        """Замена time.sleep(): сдвигает часы; при воспроизведении не ждет"""
+        if self.mode != "replay":
+            self._original_sleep(seconds)
+        self._clock += seconds
+
+    def read_input(self, prompt: str = "") -> str:
+        """Замена input(): читает строку у игрока или из трассы"""
+        if self.mode == "replay":
+            return self._next_replayed()
+
+        try:
+            line = self._original_input(prompt)
+        except EOFError:
+            self._clock = self._original_time()
+            self._write({"type": "eof", "time": self._clock})
+            raise
+        except KeyboardInterrupt:
+            self._clock = self._original_time()
+            self._write({"type": "interrupt", "time": self._clock})
+            raise
+
+        self._clock = self._original_time()
+        self.inputs_read += 1
+        self._write({"type": "input", "line": line, "time": self._clock})
+        return line
+
+    def _next_replayed(self) -> str:
+        if self._position >= len(self._records):
+            # Трасса закончилась: сначала команда выхода, а если ввод
+            # ждет подменю, которое ее не понимает - прерывание, как Ctrl+C
+            if not self._exit_sent:
+                self._exit_sent = True
+                return "exit"
+            raise KeyboardInterrupt
+
+        record = self._records[self._position]
+        self._position += 1
+        if "time" in record:
+            self._clock = record["time"]
+
+        if record["type"] == "eof":
+            raise EOFError
+        if record["type"] == "interrupt":
+            raise KeyboardInterrupt
+
+        self.inputs_read += 1
+        return record["line"]
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._trace_file is not None:
+            # Пишем построчно, чтобы трасса пережила аварийное завершение
+            self._trace_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._trace_file.flush()
+
+    def stop(self) -> None:
+        """Возвращает обычный ввод и закрывает трассу"""
+        builtins.input = self._original_input
+        time.sleep = self._original_sleep
+        time.time = self._original_time
+        if self._trace_file is not None:
+            self._trace_file.close()
+            self._trace_file = None
+        self.mode = None
+
+
+# Глобальный экземпляр записи сессий
+session_recorder = SessionRecorder()
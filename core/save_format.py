@@ -0,0 +1,183 @@
+"""
+Компактный бинарный формат сохранений XSS Game
+
+Структура файла:
+    заголовок   MAGIC | версия схемы (uint16) | число секций (uint16)
+    секции      uint16 длина имени | uint32 длина тела | имя UTF-8 | тело
+
+Тело секции - компактный JSON (без отступов): его разбирает C-парсер
+json, а длины секций позволяют читать только нужные секции. Версия 1
+(таблица строк и varint-теги) только читается.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List
+
+from core.save_json import GameJSONEncoder
+
+MAGIC = b"XSSB"
+SCHEMA_VERSION = 2
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<HI")
+_UINT32 = struct.Struct("<I")
+_DOUBLE = struct.Struct("<d")
+
+# Теги значений версии 1
+_T_NONE = 0
+_T_FALSE = 1
+_T_TRUE = 2
+_T_INT = 3
+_T_FLOAT = 4
+_T_STR = 5
+_T_LIST = 6
+_T_DICT = 7
+
+
+class SaveFormatError(ValueError):
+    """Ошибка разбора бинарного сохранения"""
+
+
+def _read_varint(buf: bytes, pos: int):
+    """Читает varint, возвращает (значение, новая позиция)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _decode_value(buf: bytes, pos: int, strings: List[str]):
+    """Декодирует значение, возвращает (значение, новая позиция)"""
+    tag = buf[pos]
+    pos += 1
+
+    if tag == _T_STR:
+        idx, pos = _read_varint(buf, pos)
+        return strings[idx], pos
+    if tag == _T_INT:
+        raw, pos = _read_varint(buf, pos)
+        return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+    if tag == _T_DICT:
+        count, pos = _read_varint(buf, pos)
+        result = {}
+        for _ in range(count):
+            key_idx, pos = _read_varint(buf, pos)
+            result[strings[key_idx]], pos = _decode_value(buf, pos, strings)
+        return result, pos
+    if tag == _T_LIST:
+        count, pos = _read_varint(buf, pos)
+        items = []
+        append = items.append
+        for _ in range(count):
+            item, pos = _decode_value(buf, pos, strings)
+            append(item)
+        return items, pos
+    if tag == _T_FLOAT:
+        return _DOUBLE.unpack_from(buf, pos)[0], pos + _DOUBLE.size
+    if tag == _T_NONE:
+        return None, pos
+    if tag == _T_TRUE:
+        return True, pos
+    if tag == _T_FALSE:
+        return False, pos
+
+    raise SaveFormatError(f"Неизвестный тег значения: {tag}")
+
+
+def dumps(sections: Dict[str, Any]) -> bytes:
+    """Кодирует словарь секций в бинарный формат"""
+    out = bytearray(_HEADER.pack(MAGIC, SCHEMA_VERSION, len(sections)))
+    for name, value in sections.items():
+        raw_name = name.encode("utf-8")
+        body = json.dumps(value, ensure_ascii=False, separators=(",", ":"), cls=GameJSONEncoder).encode("utf-8")
+        out += _SECTION.pack(len(raw_name), len(body))
+        out += raw_name
+        out += body
+    return bytes(out)
+
+
+def loads(data: bytes, only: List[str] = None) -> Dict[str, Any]:
+    """Декодирует бинарное сохранение; only - список нужных секций"""
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("Файл слишком короткий")
+
+    magic, version, section_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SaveFormatError("Это не бинарное сохранение XSS Game")
+    if version > SCHEMA_VERSION:
+        raise SaveFormatError(f"Неподдерживаемая версия формата: {version}")
+
+    try:
+        if version == 1:
+            return _loads_v1(data, section_count, only)
+
+        sections = {}
+        pos = _HEADER.size
+        for _ in range(section_count):
+            name_length, length = _SECTION.unpack_from(data, pos)
+            pos += _SECTION.size
+            name = data[pos:pos + name_length].decode("utf-8")
+            pos += name_length
+            if pos + length > len(data):
+                raise SaveFormatError(f"Секция {name} обрезана")
+            # Длина секции позволяет пропускать ненужные секции без разбора
+            if only is None or name in only:
+                sections[name] = json.loads(data[pos:pos + length])
+            pos += length
+        return sections
+    except (IndexError, struct.error, UnicodeDecodeError, ValueError) as e:
+        if isinstance(e, SaveFormatError):
+            raise
+        raise SaveFormatError(f"Поврежденное сохранение: {e}") from e
+
+
+def _loads_v1(data: bytes, section_count: int, only: List[str] = None) -> Dict[str, Any]:
+    """Чтение сохранений версии 1 (таблица строк и varint-теги)"""
+    pos = _HEADER.size
+    (string_count,) = _UINT32.unpack_from(data, pos)
+    pos += _UINT32.size
+
+    strings = []
+    for _ in range(string_count):
+        length, pos = _read_varint(data, pos)
+        strings.append(data[pos:pos + length].decode("utf-8", errors="surrogatepass"))
+        pos += length
+
+    sections = {}
+    for _ in range(section_count):
+        name_ref, pos = _read_varint(data, pos)
+        (length,) = _UINT32.unpack_from(data, pos)
+        pos += _UINT32.size
+        name = strings[name_ref]
+        if only is None or name in only:
+            sections[name], _ = _decode_value(data, pos, strings)
+        pos += length
+
+    return sections
+
+
+def is_binary_file(filename: str) -> bool:
+    """Проверяет, записан ли файл в бинарном формате"""
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_file(filename: str, sections: Dict[str, Any]) -> None:
+    """Записывает секции в бинарный файл"""
+    with open(filename, "wb") as f:
+        f.write(dumps(sections))
+
+
+def read_file(filename: str, only: List[str] = None) -> Dict[str, Any]:
+    """Читает секции из бинарного файла"""
+    with open(filename, "rb") as f:
+        return loads(f.read(), only)
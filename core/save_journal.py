@@ -0,0 +1,139 @@
+"""
+Журнал сохранений: компактные дельты состояния игрока между полными снимками
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+
+class SaveJournal:
+    """Append-only журнал изменений player_stats поверх последнего снимка.
+
+    Состояние сети дельтами не журналируется: при каждой дозаписи оно
+    целиком переписывается в отдельный файл <снимок>.network.
+    """
+
+    def __init__(self, snapshot_filename: str, compact_every: int = 200):
+        self.snapshot_filename = snapshot_filename
+        self.filename = f"{snapshot_filename}.journal"
+        self.network_filename = f"{snapshot_filename}.network"
+        self._network_text: Optional[str] = None
+        self.compact_every = max(1, compact_every)
+        self.pending: List[list] = []
+        self.records_on_disk = self._count_records()
+        self.snapshot_required = False
+
+    def _count_records(self) -> int:
+        """Подсчитывает записи, уже лежащие в журнале на диске"""
+        if not os.path.exists(self.filename):
+            return 0
+        with open(self.filename, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def record(self, op: str, key: str, value: Any = None) -> None:
+        """Добавляет запись об изменении в буфер"""
+        self.pending.append([op, key, value])
+
+    def should_compact(self) -> bool:
+        """Нужно ли вместо дозаписи сделать полный снимок"""
+        if self.snapshot_required or not os.path.exists(self.snapshot_filename):
+            return True
+        return self.records_on_disk + len(self.pending) >= self.compact_every
+
+    def flush(self) -> int:
+        """Дописывает накопленные записи в журнал одной операцией"""
+        if not self.pending:
+            return 0
+
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            for record in self.pending
+        )
+        with open(self.filename, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+
+        written = len(self.pending)
+        self.records_on_disk += written
+        self.pending.clear()
+        return written
+
+    def write_network(self, text: str) -> bool:
+        """Атомарно переписывает файл состояния сети; False, если оно не менялось"""
+        if text == self._network_text:
+            return False
+
+        temp_filename = f"{self.network_filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_filename, self.network_filename)
+        self._network_text = text
+        return True
+
+    def read_network(self) -> Optional[Dict[str, Any]]:
+        """Состояние сети, записанное после последнего снимка"""
+        if not os.path.exists(self.network_filename):
+            return None
+        with open(self.network_filename, "r", encoding="utf-8") as f:
+            text = f.read()
+        self._network_text = text
+        return json.loads(text)
+
+    def reset(self) -> None:
+        """Очищает журнал после записи полного снимка"""
+        self.pending.clear()
+        self.records_on_disk = 0
+        self.snapshot_required = False
+        self._network_text = None
+        for filename in (self.filename, self.network_filename):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def discard_pending(self) -> None:
+        """Сбрасывает буфер и требует полный снимок при следующем сохранении"""
+        self.pending.clear()
+        self.snapshot_required = True
+
+    def replay(self, player_stats: Dict[str, Any]) -> int:
+        """Применяет хвост журнала к состоянию, загруженному из снимка"""
+        if not os.path.exists(self.filename):
+            self.records_on_disk = 0
+            return 0
+
+        applied = 0
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    op, key, value = json.loads(line)
+                except (ValueError, TypeError):
+                    # Оборванная последняя строка после аварийного завершения
+                    continue
+                apply_record(player_stats, op, key, value)
+                applied += 1
+
+        self.records_on_disk = applied
+        self.pending.clear()
+        return applied
+
+
+def apply_record(player_stats: Dict[str, Any], op: str, key: str, value: Any) -> None:
+    """Применяет одну запись журнала (все операции идемпотентны)"""
+    if op == "set":
+        player_stats[key] = value
+    elif op == "add":
+        items = player_stats.setdefault(key, [])
+        if value not in items:
+            items.append(value)
+    elif op == "remove":
+        items = player_stats.get(key, [])
+        if value in items:
+            items.remove(value)
+    elif op == "skill":
+        player_stats.setdefault("skills", {})[key] = value
+    elif op == "story":
+        player_stats.setdefault("story_choices", {})[key] = value
+
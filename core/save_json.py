@@ -0,0 +1,77 @@
+"""
+JSON-кодирование сохранений с повторным использованием готовых фрагментов
+"""
+
+import json
+from typing import Any, Optional, Type
+
+
+class GameJSONEncoder(json.JSONEncoder):
+    """JSON encoder для сохранений со сложными объектами"""
+
+    def default(self, obj):
+        # Готовый фрагмент разбираем обратно (вне dump_json)
+        if isinstance(obj, CachedJSON):
+            return obj.to_dict()
+        # Если объект имеет метод to_dict, используем его
+        if hasattr(obj, 'to_dict') and callable(getattr(obj, 'to_dict')):
+            return obj.to_dict()
+        # Для других неподдерживаемых объектов возвращаем строковое представление
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+class CachedJSON:
+    """Уже закодированная секция сохранения.
+
+    Создается системами для неизменившихся данных и вставляется в файл
+    как есть. Строка неизменяема, поэтому фрагмент можно передавать
+    фоновому автосохранению без копирования.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @classmethod
+    def encode(cls, value: Any) -> "CachedJSON":
+        """Кодирует значение в фрагмент"""
+        return cls(json.dumps(value, ensure_ascii=False, indent=2, cls=GameJSONEncoder))
+
+    def to_dict(self) -> Any:
+        """Разобранное значение (для бинарного формата и экспорта)"""
+        return json.loads(self.text)
+
+
+def _encode_key(key: Any) -> str:
+    """Ключ словаря по правилам модуля json"""
+    if isinstance(key, str):
+        return json.dumps(key, ensure_ascii=False)
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(json.dumps(key))
+    raise TypeError(f"Ключ недопустимого типа: {type(key).__name__}")
+
+
+def encode_json(value: Any, level: int = 0, encoder: Optional[Type[json.JSONEncoder]] = None) -> str:
+    """Кодирует данные как json.dumps(indent=2), подставляя готовые фрагменты"""
+    if isinstance(value, CachedJSON):
+        text = value.text
+    elif isinstance(value, dict) and value:
+        inner = "  " * (level + 1)
+        items = [f"{inner}{_encode_key(key)}: {encode_json(item, level + 1, encoder)}"
+                 for key, item in value.items()]
+        return "{\n" + ",\n".join(items) + "\n" + "  " * level + "}"
+    else:
+        text = json.dumps(value, ensure_ascii=False, indent=2, cls=encoder or GameJSONEncoder)
+
+    if level and "\n" in text:
+        text = text.replace("\n", "\n" + "  " * level)
+    return text
+
+
+def dump_json(value: Any, f, encoder: Optional[Type[json.JSONEncoder]] = None) -> None:
+    """Записывает данные в открытый файл"""
+    f.write(encode_json(value, encoder=encoder))
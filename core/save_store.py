@@ -0,0 +1,158 @@
+"""
+Хранилище сохранений на SQLite: несколько слотов на профиль и таблица метаданных
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core import save_format
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    profile      TEXT    NOT NULL,
+    slot         TEXT    NOT NULL,
+    username     TEXT,
+    turn_number  INTEGER NOT NULL DEFAULT 0,
+    reputation   INTEGER NOT NULL DEFAULT 0,
+    story_stage  INTEGER NOT NULL DEFAULT 0,
+    game_version TEXT,
+    saved_at     TEXT    NOT NULL,
+    PRIMARY KEY (profile, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_saves_username ON saves (username);
+CREATE INDEX IF NOT EXISTS idx_saves_saved_at ON saves (profile, saved_at);
+
+CREATE TABLE IF NOT EXISTS save_sections (
+    profile TEXT NOT NULL,
+    slot    TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    data    BLOB NOT NULL,
+    PRIMARY KEY (profile, slot, name)
+);
+"""
+
+_METADATA_COLUMNS = ("profile", "slot", "username", "turn_number", "reputation",
+                     "story_stage", "game_version", "saved_at")
+
+
+class SaveStore:
+    """Слоты сохранений в одном файле SQLite.
+
+    Метаданные слота (игрок, ход, репутация, этап сюжета, время) лежат в
+    отдельной индексированной таблице, поэтому список сохранений читается
+    без разбора самих данных. Секции слота пишутся одной транзакцией.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Запись возможна из потока автосохранения - доступ сериализуется блокировкой
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def save_slot(self, profile: str, slot: str, sections: Dict[str, Any]) -> None:
+        """Атомарно записывает все секции слота и его метаданные"""
+        stats = sections.get("game", {}).get("player_stats", {})
+        metadata = (
+            profile,
+            slot,
+            stats.get("username"),
+            int(stats.get("turn_number", 0) or 0),
+            int(stats.get("reputation", 0) or 0),
+            int(stats.get("story_stage", 0) or 0),
+            sections.get("game", {}).get("game_version"),
+            datetime.now().isoformat(),
+        )
+        blobs = [(profile, slot, name, save_format.dumps({name: value}))
+                 for name, value in sections.items()]
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO saves ({', '.join(_METADATA_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_METADATA_COLUMNS))})",
+                metadata
+            )
+            self._conn.execute("DELETE FROM save_sections WHERE profile = ? AND slot = ?", (profile, slot))
+            self._conn.executemany(
+                "INSERT INTO save_sections (profile, slot, name, data) VALUES (?, ?, ?, ?)",
+                blobs
+            )
+
+    def load_slot(self, profile: str, slot: str, only: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Читает секции слота; only - список нужных секций"""
+        query = "SELECT name, data FROM save_sections WHERE profile = ? AND slot = ?"
+        params: list = [profile, slot]
+        if only:
+            query += f" AND name IN ({', '.join('?' * len(only))})"
+            params.extend(only)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        if not rows:
+            return None
+
+        sections = {}
+        for name, data in rows:
+            sections.update(save_format.loads(data))
+        return sections
+
+    def list_slots(self, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Метаданные сохранений, от новых к старым"""
+        query = f"SELECT {', '.join(_METADATA_COLUMNS)} FROM saves"
+        params: tuple = ()
+        if profile is not None:
+            query += " WHERE profile = ?"
+            params = (profile,)
+        query += " ORDER BY saved_at DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(_METADATA_COLUMNS, row)) for row in rows]
+
+    def find_by_username(self, username: str) -> List[Dict[str, Any]]:
+        """Сохранения игрока по имени (по индексу)"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_METADATA_COLUMNS)} FROM saves WHERE username = ? ORDER BY saved_at DESC",
+                (username,)
+            ).fetchall()
+        return [dict(zip(_METADATA_COLUMNS, row)) for row in rows]
+
+    def has_slot(self, profile: str, slot: str) -> bool:
+        """Проверяет наличие слота"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM saves WHERE profile = ? AND slot = ?", (profile, slot)
+            ).fetchone()
+        return row is not None
+
+    def delete_slot(self, profile: str, slot: str) -> bool:
+        """Удаляет слот вместе с данными"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM saves WHERE profile = ? AND slot = ?", (profile, slot))
+            self._conn.execute("DELETE FROM save_sections WHERE profile = ? AND slot = ?", (profile, slot))
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        """Закрывает соединение с базой"""
+        with self._lock:
+            self._conn.close()
+
+
+# Открытые хранилища: сессии с одной базой делят одно соединение
+_stores: Dict[str, SaveStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(db_path: str) -> SaveStore:
+    """Возвращает хранилище для файла базы, открывая его при первом обращении"""
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = SaveStore(db_path)
+            _stores[db_path] = store
+        return store
@@ -0,0 +1,156 @@
+"""
+Игровые сессии: отдельные экземпляры систем для каждого игрока в одном процессе
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Фабрики систем, которые создаются отдельно для каждой сессии
+_system_factories: Dict[str, Callable[[], Any]] = {}
+
+_current_session: contextvars.ContextVar = contextvars.ContextVar("xss_session", default=None)
+
+
+class GameSession:
+    """Набор систем одного игрока.
+
+    Системы создаются лениво при первом обращении. Каталоги из
+    config/game_data.py не копируются - они общие для всех сессий.
+    """
+
+    def __init__(self, session_id: str = "default", save_file: Optional[str] = None):
+        self.session_id = session_id
+        self.save_file = save_file
+        self._systems: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get_system(self, name: str) -> Any:
+        """Возвращает экземпляр системы этой сессии, создавая его при необходимости"""
+        system = self._systems.get(name)
+        if system is not None:
+            return system
+
+        with self._lock:
+            system = self._systems.get(name)
+            if system is None:
+                factory = _system_factories.get(name)
+                if factory is None:
+                    raise KeyError(f"Неизвестная система: {name}")
+                # Конструкторы обращаются к другим системам - они должны
+                # найти системы этой же сессии
+                token = _current_session.set(self)
+                try:
+                    system = factory()
+                finally:
+                    _current_session.reset(token)
+                self._systems[name] = system
+        return system
+
+    def has_system(self, name: str) -> bool:
+        """Создана ли система в этой сессии (без ее создания)"""
+        return name in self._systems
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _system_factories:
+            return self.get_system(name)
+        raise AttributeError(name)
+
+    @contextmanager
+    def activate(self) -> Iterator["GameSession"]:
+        """Делает сессию текущей для кода внутри блока with"""
+        token = _current_session.set(self)
+        try:
+            yield self
+        finally:
+            _current_session.reset(token)
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Выполняет функцию в контексте этой сессии"""
+        with self.activate():
+            return func(*args, **kwargs)
+
+
+class SessionSystem:
+    """Прокси на экземпляр системы в текущей сессии.
+
+    Модули экспортируют такие прокси вместо глобальных экземпляров, поэтому
+    существующий код вида `from core.game_state import game_state` работает
+    с системами той сессии, в которой он выполняется.
+    """
+
+    __slots__ = ("_system_name",)
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_system_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(current_session().get_system(self._system_name), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(current_session().get_system(self._system_name), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(current_session().get_system(self._system_name), attr)
+
+    def __repr__(self) -> str:
+        return f"<SessionSystem {self._system_name} [{current_session().session_id}]>"
+
+
+def session_system(name: str, factory: Callable[[], Any]) -> SessionSystem:
+    """Регистрирует фабрику системы и возвращает прокси на нее"""
+    _system_factories[name] = factory
+    return SessionSystem(name)
+
+
+def resolve(system: Any) -> Any:
+    """Возвращает настоящий экземпляр системы текущей сессии для прокси"""
+    if isinstance(system, SessionSystem):
+        return current_session().get_system(object.__getattribute__(system, "_system_name"))
+    return system
+
+
+def is_created(system: Any) -> bool:
+    """Создан ли экземпляр системы в текущей сессии; прокси его не создает"""
+    if isinstance(system, SessionSystem):
+        return current_session().has_system(object.__getattribute__(system, "_system_name"))
+    return True
+
+
+class SessionManager:
+    """Реестр активных сессий процесса"""
+
+    def __init__(self):
+        self.default_session = GameSession()
+        self.sessions: Dict[str, GameSession] = {"default": self.default_session}
+        self._lock = threading.Lock()
+
+    def open_session(self, session_id: str, save_file: Optional[str] = None) -> GameSession:
+        """Создает сессию игрока или возвращает уже открытую"""
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = GameSession(session_id, save_file or f"xss_save_{session_id}.json")
+                self.sessions[session_id] = session
+            return session
+
+    def close_session(self, session_id: str) -> Optional[GameSession]:
+        """Закрывает сессию; ее системы освобождаются вместе с ней"""
+        if session_id == "default":
+            return None
+        with self._lock:
+            return self.sessions.pop(session_id, None)
+
+    def get_session(self, session_id: str) -> Optional[GameSession]:
+        """Получить сессию по идентификатору"""
+        return self.sessions.get(session_id)
+
+
+def current_session() -> GameSession:
+    """Текущая сессия; вне activate() - сессия по умолчанию (одиночная игра)"""
+    return _current_session.get() or session_manager.default_session
+
+
+# Глобальный реестр сессий
+session_manager = SessionManager()
@@ -2,7 +2,6 @@
 Система фракций для XSS Game 0.3.0
 """
 
-import random
 import time
 from typing import Dict, List, Optional, Tuple
 
@@ -11,6 +10,10 @@ from ui.effects import typing_effect, show_ascii_art, boxed_text
 from core.game_state import game_state
 from systems.audio import audio_system
 from config.game_data import FACTIONS
+from systems.event_system import event_system, FactionReputationChangedEvent
+from core.replay import rng_stream
+
+random = rng_stream("factions")
 
 
 class FactionSystem:
@@ -514,6 +517,9 @@ class FactionSystem:
         if faction_id in self.faction_reputation:
             old_rep = self.faction_reputation[faction_id]
             self.faction_reputation[faction_id] = max(0, min(100, old_rep + amount))
+            event_system.dispatch(FactionReputationChangedEvent(
+                faction_id, old_rep, self.faction_reputation[faction_id]
+            ))
             
             if amount > 0:
                 print(f"{Colors.SUCCESS}[+] Репутация в {faction_id}: +{amount}{Colors.RESET}")
@@ -2,7 +2,6 @@
 Система форума и контактов для XSS Game
 """
 
-import random
 import time
 import textwrap
 from typing import List, Dict, Optional
@@ -12,6 +11,9 @@ from ui.effects import typing_effect
 from core.game_state import game_state
 from systems.audio import audio_system
 from config.game_data import FORUM_POSTS, CONTACTS
+from core.replay import rng_stream
+
+random = rng_stream("forum")
 
 
 class ForumSystem:
@@ -266,7 +268,7 @@ class ForumSystem:
         """Система личных сообщений"""
         player_contacts = game_state.get_stat("contacts", [])
         
-        if contact_name not in player_contacts:
+        if not game_state.has_contact(contact_name):
             print(f"\n{Colors.ERROR}❌ У вас нет контакта с именем '{contact_name}'{Colors.RESET}")
             available = ', '.join(player_contacts) if player_contacts else 'нет'
             print(f"{Colors.INFO}Доступные контакты: {available}{Colors.RESET}")
@@ -2,13 +2,16 @@
 Мини-игры для XSS Game
 """
 
-import random
 import time
 from typing import Tuple
 
 from ui.colors import XSSColors
 from systems.audio import audio_system
 from core.game_state import game_state
+from core.session import session_system
+from core.replay import rng_stream
+
+random = rng_stream("minigames")
 
 
 class Minigame:
@@ -7531,5 +7534,5 @@ class MinigameHub:
         return game_id, self.games[game_id]
 
 
-# Глобальный экземпляр центра мини-игр
-minigame_hub = MinigameHub()
\ No newline at end of file
+# Экземпляр центра мини-игр текущей сессии (см. core/session.py)
+minigame_hub = session_system("minigame_hub", MinigameHub)
\ No newline at end of file
@@ -2,16 +2,20 @@
 Система миссий для XSS Game
 """
 
-import random
 import time
 from typing import Dict, List, Optional, Tuple
 
 from ui.colors import XSSColors as Colors
 from ui.effects import typing_effect, show_ascii_art, progress_bar, pulse_text, animate_text, boxed_text
 from core.game_state import game_state
+from core.session import session_system
 from systems.audio import audio_system
 from gameplay.minigames import minigame_hub
 from config.game_data import MISSIONS
+from core.replay import rng_stream
+from systems.timers import TimerScheduler, schedule_deadline, levels_up_to
+
+random = rng_stream("missions")
 
 
 class MissionSystem:
@@ -23,6 +27,10 @@ class MissionSystem:
         self.mission_timers = {}  # Для отслеживания времени
         self.mission_events = {}  # Активные события миссий
 
+        # Предупреждения о времени: планировщик сессии и уже показанные уровни
+        self.timer_scheduler = TimerScheduler()
+        self.timer_warnings: Dict[str, List[str]] = {}
+
     def get_available_missions(self) -> Dict[str, dict]:
         """Получает список доступных миссий"""
         available = {}
@@ -252,7 +260,7 @@ class MissionSystem:
 
         # Устанавливаем таймер для миссий с временными ограничениями
         if "time_limit" in mission_data:
-            self.mission_timers[mission_id] = (time.time(), mission_data["time_limit"])
+            self.set_mission_timer(mission_id, time.time(), mission_data["time_limit"])
             print(
                 f"{Colors.WARNING}⏰ Миссия имеет временное ограничение: {mission_data['time_limit']} часов{Colors.RESET}")
 
@@ -463,7 +471,6 @@ class MissionSystem:
 
         # 2. Снаряжение (снижает шанс провала)
         equipment_bonus = 0
-        inventory = game_state.get_stat("inventory", [])
 
         # Специфичные предметы для разных типов миссий
         mission_type = self._determine_mission_type(mission_data)
@@ -475,10 +482,10 @@ class MissionSystem:
             "social_eng": ["fake_id_generator", "phishing_kit", "fake_documents"]
         }
 
-        # Проверяем наличие полезных предметов
-        for item in inventory:
-            for skill_type, items_list in helpful_items.items():
-                if item in items_list:
+        # Проверяем наличие полезных предметов (их мало, инвентарь может быть большим)
+        for items_list in helpful_items.values():
+            for item in items_list:
+                if game_state.has_item(item):
                     equipment_bonus += 5  # 5% за каждый полезный предмет
 
         # 3. Результат мини-игры (критически важен)
@@ -536,8 +543,8 @@ class MissionSystem:
         # 8. VPN бонус через инвентарь (упрощенная версия)
         vpn_bonus = 0
         vpn_items = ["vpn_subscription", "elite_proxy", "proxy_network"]
-        for item in inventory:
-            if item in vpn_items:
+        for item in vpn_items:
+            if game_state.has_item(item):
                 vpn_bonus -= 10  # -10% за каждый VPN/прокси предмет
                 break  # Учитываем только один
 
@@ -604,6 +611,7 @@ class MissionSystem:
         print(f"{Colors.ERROR}[!] Предупреждения: {warnings}/3{Colors.RESET}")
 
         # Сбрасываем миссию
+        failed_mission = game_state.get_stat("active_mission")
         game_state.set_stat("active_mission", None)
         game_state.set_stat("mission_progress", 0)
 
@@ -611,8 +619,9 @@ class MissionSystem:
         try:
             from systems.event_system import mission_statistics
             mission_statistics.record_mission_failure(
-                game_state.get_stat("active_mission"),
-                reason="detected"
+                failed_mission,
+                reason="detected",
+                mission_type=mission_data.get("type", "normal")
             )
         except ImportError:
             pass
@@ -731,6 +740,55 @@ class MissionSystem:
 
         return True
 
+    def set_mission_timer(self, mission_id: str, start_time: float, time_limit: float) -> None:
+        """Устанавливает таймер миссии и планирует предупреждения о времени.
+
+        Для уже идущей миссии (сокращение времени) показанные предупреждения
+        не повторяются.
+        """
+        if mission_id not in self.mission_timers:
+            self.timer_warnings.pop(mission_id, None)
+        self.mission_timers[mission_id] = (start_time, time_limit)
+        self._schedule_timer(mission_id)
+
+    def clear_mission_timer(self, mission_id: str) -> None:
+        """Снимает таймер миссии вместе с запланированными предупреждениями"""
+        self.mission_timers.pop(mission_id, None)
+        self.timer_warnings.pop(mission_id, None)
+        self.timer_scheduler.cancel(mission_id)
+
+    def reschedule_timers(self) -> None:
+        """Планирует предупреждения для всех таймеров (после загрузки)"""
+        for mission_id in self.mission_timers:
+            self._schedule_timer(mission_id)
+
+    def poll_timers(self) -> int:
+        """Вызывает наступившие предупреждения о времени"""
+        return self.timer_scheduler.poll()
+
+    def _schedule_timer(self, mission_id: str) -> None:
+        start_time, time_limit = self.mission_timers[mission_id]
+        schedule_deadline(self.timer_scheduler, mission_id, start_time, time_limit,
+                          self._on_mission_deadline, self.timer_warnings.get(mission_id, ()))
+
+    def _on_mission_deadline(self, mission_id: str, warning_level: str) -> None:
+        """Пробуждение таймера: предупреждение для активной миссии"""
+        event_manager = getattr(self, "event_manager", None)
+        if event_manager is None or mission_id not in self.mission_timers:
+            return
+        if game_state.get_stat("active_mission") != mission_id:
+            return
+
+        shown = self.timer_warnings.setdefault(mission_id, [])
+        shown.extend(level for level in levels_up_to(warning_level) if level not in shown)
+
+        start_time, time_limit = self.mission_timers[mission_id]
+        remaining = max(0.0, time_limit - (time.time() - start_time) / 3600)
+        event_manager.trigger_event("time_warning",
+                                    mission_id=mission_id,
+                                    time_remaining=remaining,
+                                    warning_level=warning_level)
+
     def _handle_mission_timeout(self, mission_id: str) -> None:
         """Обрабатывает истечение времени миссии"""
         mission_data = self.missions.get(mission_id, {})
@@ -749,8 +807,7 @@ class MissionSystem:
         game_state.set_stat("active_mission", None)
         game_state.set_stat("mission_progress", 0)
 
-        if mission_id in self.mission_timers:
-            del self.mission_timers[mission_id]
+        self.clear_mission_timer(mission_id)
 
     def _work_multi_stage_mission(self, mission_id: str, mission_data: dict) -> bool:
         """Обработка многоэтапных миссий"""
@@ -981,7 +1038,7 @@ class MissionSystem:
             if mission_id in self.mission_timers:
                 start_time, time_limit = self.mission_timers[mission_id]
                 new_limit = time_limit * 0.7  # Сокращаем на 30%
-                self.mission_timers[mission_id] = (start_time, new_limit)
+                self.set_mission_timer(mission_id, start_time, new_limit)
                 print(f"{Colors.ERROR}[!] Время миссии сокращено!{Colors.RESET}")
 
         # Сохраняем событие для отслеживания
@@ -1240,9 +1297,8 @@ class MissionSystem:
                 return False
 
         req_items = stage_data.get("req_items", [])
-        inventory = game_state.get_stat("inventory", [])
         for item in req_items:
-            if item not in inventory:
+            if not game_state.has_item(item):
                 print(f"{Colors.ERROR}Требуется предмет: {item}{Colors.RESET}")
                 return False
 
@@ -1640,5 +1696,5 @@ def show_hacking_progress(target: str, progress_steps: list) -> None:
     print(f"\n{Colors.SUCCESS}🎉 ВЗЛОМ ЗАВЕРШЕН УСПЕШНО!{Colors.RESET}")
 
 
-# Глобальный экземпляр системы миссий
-mission_system = MissionSystem()
\ No newline at end of file
+# Экземпляр системы миссий текущей сессии (см. core/session.py)
+mission_system = session_system("mission_system", MissionSystem)
\ No newline at end of file
@@ -6,18 +6,22 @@ import os
 import sys
 import time
 import json
+import argparse
 from datetime import datetime
-import random
 
 # Добавляем текущую директорию в путь для импортов
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Основные импорты
+from config.settings import GAME_SETTINGS
 from ui.colors import XSSColors, print_xss_banner
 from ui.effects import typing_effect, show_ascii_art, boxed_text
 from ui.display import show_status, show_help
 from ui.command_completion import command_completer, smart_prompt
 from core.game_state import game_state
+from core.session import is_created
+from core import save_format
+from core.save_json import dump_json
 from core.character_creation import character_creator
 from systems.audio import audio_system
 from systems.network import network_system  # Новая система
@@ -27,7 +31,13 @@ from gameplay.minigames import minigame_hub
 from gameplay.factions import faction_system
 from systems.market import market_system
 from systems.crypto import crypto_system
-from systems.event_system import initialize_advanced_mission_systems, mission_statistics, mission_notifications
+from systems.event_system import event_system, initialize_advanced_mission_systems, mission_statistics, mission_notifications
+from systems.world_events import world_events, register_world_event_handlers
+from systems.achievements import register_achievement_handlers
+from systems.autosave import AutosaveService, register_game_state, snapshot_copy
+from core.replay import rng_stream, session_recorder
+
+random = rng_stream("main")
 
 
 class XSSGame:
@@ -39,6 +49,8 @@ class XSSGame:
         self.codename = "NETWORK FOUNDATIONS"
         self.commands = self._setup_commands()
         self.first_run = False
+        self.autosave = AutosaveService()
+        self.turns_played = 0
 
     def _setup_commands(self) -> dict:
         """Настройка команд игры с новыми возможностями"""
@@ -112,6 +124,8 @@ class XSSGame:
             # Система
             "save": self._cmd_save,
             "load": self._cmd_load,
+            "export": self._cmd_export,
+            "saves": self._cmd_saves,
             "help": self._cmd_help,
             "exit": self._cmd_exit,
             "quit": self._cmd_exit,
@@ -128,6 +142,7 @@ class XSSGame:
 
             # Команды для отладки и тестирования
             "test_event": self._cmd_test_event,
+            "event_stats": self._cmd_event_stats,
             "simulate_mission": self._cmd_simulate_mission,
         }
 
@@ -141,10 +156,12 @@ class XSSGame:
                 if audio_system.music_enabled:
                     audio_system.start_background_music()
 
-            save_exists = os.path.exists("xss_save.json")
+            save_exists = game_state.has_saved_game()
 
             if save_exists:
                 print(f"\n{XSSColors.INFO}ℹ️ Обнаружено сохранение игры.{XSSColors.RESET}")
+                if game_state.save_store is not None:
+                    self._show_save_slots()
                 choice = command_completer.get_enhanced_input(
                     f"{XSSColors.PROMPT}Загрузить сохранение? (y/n/new): {XSSColors.RESET}"
                 ).lower()
@@ -165,6 +182,12 @@ class XSSGame:
             self._setup_command_completion()
             self._show_welcome_message()
             self._initialize_advanced_systems()
+            self._initialize_autosave()
+            # События команды копятся и доставляются в конце хода
+            event_system.set_deferred(True)
+            register_world_event_handlers()
+            register_achievement_handlers()
+            event_system.enable_profiling(GAME_SETTINGS.get('event_profiling', False))
             self._update_story()
 
         except Exception as e:
@@ -177,6 +200,9 @@ class XSSGame:
             # Инициализируем продвинутые системы миссий
             self.mission_event_manager = initialize_advanced_mission_systems(mission_system)
 
+            # В хранилище слотов данные пишутся вместе с основным сохранением
+            game_state.register_save_section("advanced", self._collect_advanced_data, self._apply_advanced_data)
+
             # Загружаем сохраненную статистику если есть
             self._load_advanced_data()
 
@@ -186,6 +212,20 @@ class XSSGame:
             print(f"{XSSColors.WARNING}⚠️ Ошибка инициализации продвинутых систем: {e}{XSSColors.RESET}")
             # Игра должна работать и без продвинутых систем
 
+    def _initialize_autosave(self) -> None:
+        """Настраивает фоновое автосохранение"""
+        if self.autosave.frequency <= 0:
+            return
+
+        register_game_state(self.autosave)
+        if game_state.save_store is None:
+            self.autosave.register_section(
+                "advanced",
+                lambda: snapshot_copy(self._collect_advanced_data(cached=self._json_saves())),
+                self._write_advanced_data
+            )
+        self.autosave.start()
+
     def _handle_critical_error(self, error: Exception) -> None:
         """Обработка критических ошибок"""
         import traceback
@@ -368,7 +408,7 @@ Traceback:
             else:
                 # Последняя попытка - простейшее сохранение
                 with open(emergency_file, "w", encoding="utf-8") as f:
-                    json.dump(game_state.player_stats, f)
+                    json.dump(game_state.player_stats.to_dict(), f)
                 print(f"{XSSColors.SUCCESS}✅ Базовое аварийное сохранение: {emergency_file}{XSSColors.RESET}")
         except Exception as e:
             print(f"{XSSColors.ERROR}❌ Не удалось создать аварийное сохранение: {e}{XSSColors.RESET}")
@@ -616,8 +656,11 @@ Traceback:
     def _cmd_exit(self, args: list) -> None:
         print(f"\n{XSSColors.WARNING}Отключение от xss.is...{XSSColors.RESET}")
 
+        # Дожидаемся фоновой записи, чтобы она не перезаписала финальное сохранение
+        self.autosave.stop()
+
         if game_state.get_stat("autosave_enabled", True):
-            game_state.save_game()
+            game_state.save_game(compact=True)
             print(f"{XSSColors.SUCCESS}💾 Игра автоматически сохранена{XSSColors.RESET}")
 
         audio_system.play_sound("logout")
@@ -704,6 +747,11 @@ Traceback:
         event_chance = random.random()
 
         if event_chance < 0.1:  # 10% шанс
+            # Глобальное событие каталога RANDOM_EVENTS;
+            # если выпавшее событие уже идет - мелкий инцидент
+            if world_events.roll(game_state.get_stat('turn_number', 0)) is not None:
+                return
+
             events = [
                 self._network_intrusion_event,
                 self._market_fluctuation_event,
@@ -884,11 +932,12 @@ Traceback:
     def _handle_interrupt(self) -> None:
         """Обработка прерывания (Ctrl+C)"""
         print(f"\n\n{XSSColors.WARNING}Прерывание обнаружено...{XSSColors.RESET}")
+        self.autosave.stop()
 
         try:
             save_choice = input(f"{XSSColors.PROMPT}Сохранить игру перед выходом? (y/n): {XSSColors.RESET}").lower()
             if save_choice in ['y', 'yes']:
-                game_state.save_game()
+                game_state.save_game(compact=True)
         except:
             # Если пользователь снова нажал Ctrl+C
             pass
@@ -931,7 +980,7 @@ Traceback:
             "notifications": "Показать активные уведомления",
             "show_notifications": "Показать уведомления (алиас)",
             "clear_notifications": "Очистить все уведомления",
-            "mission_history": "История всех миссий",
+            "mission_history": "История миссий: [ok|fail] [<N>d] [mission_id]",
             "team_details": "Детали текущей команды",
             "moral_profile": "Моральный профиль игрока",
             "abort_mission": "Прервать активную миссию",
@@ -941,8 +990,13 @@ Traceback:
             # Команды чата
             "chat": "Глобальный чат",
 
+            # Сохранения
+            "export": "Экспорт сохранения в JSON [файл]",
+            "saves": "Список слотов сохранений (save/load [слот])",
+
             # Отладочные команды
             "test_event": "Тестировать событие (отладка)",
+            "event_stats": "Метрики событий в JSON [on|off|reset] (отладка)",
             "simulate_mission": "Симулировать миссию (отладка)",
 
             # Дополнительные алиасы
@@ -1190,8 +1244,7 @@ Traceback:
             game_state.set_stat("current_mission_stage", 0)
 
             # Очищаем таймеры и события
-            if active_mission in mission_system.mission_timers:
-                del mission_system.mission_timers[active_mission]
+            mission_system.clear_mission_timer(active_mission)
             if active_mission in mission_system.mission_events:
                 del mission_system.mission_events[active_mission]
             if active_mission in mission_system.active_teams:
@@ -1253,17 +1306,34 @@ Traceback:
         mission_notifications.clear_all_notifications()
 
     def _cmd_mission_history(self, args: list) -> None:
-        """Показать историю миссий"""
+        """Показать историю миссий: mission_history [ok|fail] [<N>d] [mission_id]"""
         history = mission_statistics.mission_history
 
         if not history:
             print(f"{XSSColors.INFO}История миссий пуста{XSSColors.RESET}")
             return
 
+        # Фильтры: исход, окно в днях, миссия
+        success = None
+        since = None
+        mission_id = None
+        for arg in args:
+            if arg in ("ok", "success"):
+                success = True
+            elif arg in ("fail", "failed"):
+                success = False
+            elif arg.endswith("d") and arg[:-1].isdigit():
+                since = time.time() - int(arg[:-1]) * 86400
+            else:
+                mission_id = arg
+
         print(f"\n{XSSColors.HEADER}━━━━━━━━━━━━━━━━ ИСТОРИЯ МИССИЙ ━━━━━━━━━━━━━━━━{XSSColors.RESET}")
 
         # Показываем последние 10 миссий
-        recent_missions = history[-10:]
+        recent_missions = history.query(mission_id=mission_id, success=success, since=since, limit=10)
+        if not recent_missions:
+            print(f"{XSSColors.INFO}Нет миссий по заданным фильтрам{XSSColors.RESET}")
+            return
 
         for i, mission in enumerate(recent_missions, 1):
             success_icon = "✅" if mission.get("success") else "❌"
@@ -1281,8 +1351,8 @@ Traceback:
             else:
                 print(f"      Причина провала: {mission.get('reason', 'Неизвестно')}")
 
-        if len(history) > 10:
-            print(f"\n{XSSColors.INFO}Показаны последние 10 из {len(history)} миссий{XSSColors.RESET}")
+        if len(recent_missions) < len(history):
+            print(f"\n{XSSColors.INFO}Показаны последние {len(recent_missions)} из {len(history)} миссий{XSSColors.RESET}")
 
     def _cmd_team_details(self, args: list) -> None:
         """Показать подробности о команде"""
@@ -1381,6 +1451,26 @@ Traceback:
         if negative_choices > 0:
             print(f"   Эгоистических: {XSSColors.ERROR}{negative_choices}{XSSColors.RESET}")
 
+    def _cmd_event_stats(self, args: list) -> None:
+        """Метрики системы событий (отладка): event_stats [on|off|reset]"""
+        action = args[0].lower() if args else None
+        if action == "on":
+            event_system.enable_profiling(True)
+            print(f"{XSSColors.SUCCESS}Профилирование событий включено{XSSColors.RESET}")
+            return
+        if action == "off":
+            event_system.enable_profiling(False)
+            print(f"{XSSColors.WARNING}Профилирование событий выключено{XSSColors.RESET}")
+            return
+        if action == "reset":
+            event_system.metrics.reset()
+            print(f"{XSSColors.INFO}Метрики событий сброшены{XSSColors.RESET}")
+            return
+
+        print(json.dumps(event_system.metrics.snapshot(), ensure_ascii=False, indent=2))
+        if not event_system.metrics.enabled:
+            print(f"{XSSColors.INFO}💡 Задержки замеряются после 'event_stats on'{XSSColors.RESET}")
+
     def _cmd_test_event(self, args: list) -> None:
         """Тестовая команда для проверки событий (только для отладки)"""
         if not args:
@@ -1470,6 +1560,7 @@ Traceback:
             crypto_system.update_crypto_prices()
 
             turn = game_state.get_stat('turn_number', 0)
+            world_events.tick(turn)
             if turn % 5 == 0:
                 game_state.decay_heat_level()
 
@@ -1488,6 +1579,13 @@ Traceback:
         except Exception as e:
             print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка обновления продвинутых систем: {e}{XSSColors.RESET}")
 
+    def _flush_events(self) -> None:
+        """Доставляет накопленные за ход события одним пакетом"""
+        try:
+            event_system.flush()
+        except Exception as e:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка доставки событий: {e}{XSSColors.RESET}")
+
     def _trigger_random_mission_event(self) -> None:
         """Запускает случайное событие миссии"""
         active_mission = game_state.get_stat("active_mission")
@@ -1554,6 +1652,7 @@ Traceback:
             try:
                 game_state.update_last_seen()
                 turn = game_state.increment_turn()
+                self.turns_played += 1
 
                 if self._check_game_over():
                     break
@@ -1562,7 +1661,7 @@ Traceback:
                 try:
                     if turn % 5 == 0:
                         self._process_random_events()
-                    if turn % 3 == 0:
+                    if turn % 3 == 0 and is_created(network_system):
                         network_system.update_network_state()
 
                     # НОВОЕ: Показываем важные уведомления
@@ -1572,6 +1671,9 @@ Traceback:
                 except Exception as e:
                     print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка системного обновления: {e}{XSSColors.RESET}")
 
+                # События начала хода (и хода с пустым вводом) - до отрисовки приглашения
+                self._flush_events()
+
                 prompt = self._get_dynamic_prompt()
 
                 try:
@@ -1597,6 +1699,15 @@ Traceback:
                 except Exception as e:
                     print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка обновления систем: {e}{XSSColors.RESET}")
 
+                # События команды доставляются до снимка автосохранения
+                self._flush_events()
+
+                # Снимок на границе хода, запись - в фоновом потоке
+                try:
+                    self.autosave.on_turn(turn)
+                except Exception as e:
+                    print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Ошибка автосохранения: {e}{XSSColors.RESET}")
+
                 # Сброс счетчика ошибок при успешном выполнении
                 consecutive_errors = 0
 
@@ -1610,6 +1721,7 @@ Traceback:
                 if consecutive_errors >= max_consecutive_errors:
                     print(
                         f"{XSSColors.DANGER}[КРИТИЧНО] Слишком много ошибок подряд. Аварийное сохранение...{XSSColors.RESET}")
+                    self.autosave.stop()
                     self._emergency_save()
                     break
 
@@ -1621,10 +1733,9 @@ Traceback:
             return
 
         # Показываем только высокоприоритетные уведомления
-        high_priority = [n for n in mission_notifications.active_notifications
-                         if n["priority"] == "high"]
+        high_priority = mission_notifications.get_notifications_by_priority("high", 2)
 
-        for notification in high_priority[:2]:  # Максимум 2 уведомления за раз
+        for notification in high_priority:  # Максимум 2 уведомления за раз
             mission_notifications._display_notification(notification)
 
     # Добавить метод для расширенной справки:
@@ -1666,10 +1777,13 @@ Traceback:
     def _cmd_save(self, args: list) -> None:
         """Сохранить игру с продвинутыми данными"""
         try:
+            # Снимок автосохранения старее этого сохранения - отменяем
+            self.autosave.cancel_pending()
+
             # Сохраняем основное состояние
-            if game_state.save_game():
-                # Сохраняем дополнительные данные
-                if hasattr(self, 'mission_event_manager'):
+            if game_state.save_game(slot=args[0] if args else None):
+                # Сохраняем дополнительные данные (хранилище слотов пишет их само)
+                if hasattr(self, 'mission_event_manager') and game_state.save_store is None:
                     self._save_advanced_data()
                 print(f"{XSSColors.SUCCESS}✅ Игра сохранена{XSSColors.RESET}")
             else:
@@ -1677,27 +1791,55 @@ Traceback:
         except Exception as e:
             print(f"{XSSColors.ERROR}❌ Ошибка сохранения: {e}{XSSColors.RESET}")
 
+    @staticmethod
+    def _json_saves() -> bool:
+        """Сохранения пишутся в JSON (можно использовать готовые фрагменты)"""
+        return GAME_SETTINGS.get('save_format') != 'binary'
+
+    def _collect_advanced_data(self, cached: bool = False) -> dict:
+        """Собирает данные продвинутых систем для сохранения
+
+        cached - статистика и история отдаются готовыми JSON-фрагментами.
+        """
+        if cached:
+            stats = mission_statistics.stats_fragment()
+            history = mission_statistics.history_fragment()
+        else:
+            stats = mission_statistics.stats
+            history = mission_statistics.mission_history.to_dict()
+
+        return {
+            "mission_statistics": stats,
+            "mission_history": history,
+            "mission_aggregates": mission_statistics.aggregates_state(),
+            "active_teams": mission_system.active_teams,
+            "mission_timers": mission_system.mission_timers,
+            "mission_timer_warnings": mission_system.timer_warnings,
+            "mission_events": mission_system.mission_events
+        }
+
+    def _write_advanced_data(self, advanced_data: dict) -> None:
+        """Записывает данные продвинутых систем на диск"""
+        with game_state.save_lock:
+            if GAME_SETTINGS.get('save_format') == 'binary':
+                save_format.write_file("advanced_save.json", advanced_data)
+            else:
+                with open("advanced_save.json", "w", encoding="utf-8") as f:
+                    dump_json(advanced_data, f)
+
     def _save_advanced_data(self) -> None:
         """Сохраняет данные продвинутых систем"""
         try:
-            advanced_data = {
-                "mission_statistics": mission_statistics.stats,
-                "mission_history": mission_statistics.mission_history,
-                "active_teams": mission_system.active_teams,
-                "mission_timers": mission_system.mission_timers,
-                "mission_events": mission_system.mission_events
-            }
-
-            with open("advanced_save.json", "w", encoding="utf-8") as f:
-                json.dump(advanced_data, f, indent=2, default=str)
+            self._write_advanced_data(self._collect_advanced_data(cached=self._json_saves()))
 
         except Exception as e:
             print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Не удалось сохранить продвинутые данные: {e}{XSSColors.RESET}")
 
     def _cmd_load(self, args: list) -> None:
         """Загрузить игру с продвинутыми данными"""
-        if os.path.exists("xss_save.json"):
-            if game_state.load_game():
+        slot = args[0] if args else None
+        if game_state.has_saved_game(slot):
+            if game_state.load_game(slot=slot):
                 # Загружаем дополнительные данные
                 if hasattr(self, 'mission_event_manager'):
                     self._load_advanced_data()
@@ -1705,34 +1847,119 @@ Traceback:
         else:
             print(f"{XSSColors.ERROR}Файл сохранения не найден{XSSColors.RESET}")
 
+    def _cmd_saves(self, args: list) -> None:
+        """Показать слоты сохранений"""
+        if game_state.save_store is None:
+            print(f"{XSSColors.INFO}Слоты доступны при save_backend = 'sqlite' в настройках{XSSColors.RESET}")
+            return
+        self._show_save_slots()
+
+    def _show_save_slots(self) -> None:
+        """Выводит метаданные слотов (сами сохранения не читаются)"""
+        saves = game_state.list_saves()
+        if not saves:
+            print(f"{XSSColors.WARNING}Сохранений нет{XSSColors.RESET}")
+            return
+
+        print(f"\n{XSSColors.HEADER}💾 СЛОТЫ СОХРАНЕНИЙ:{XSSColors.RESET}")
+        for save in saves:
+            marker = "▶" if save["slot"] == game_state.save_slot else " "
+            saved_at = (save["saved_at"] or "")[:16].replace("T", " ")
+            print(f"   {marker} {XSSColors.INFO}{save['slot']:<12}{XSSColors.RESET} "
+                  f"{save['username'] or '?':<12} ход {save['turn_number']:<5} "
+                  f"реп. {save['reputation']:<5} этап {save['story_stage']}  {saved_at}")
+
+    def _cmd_export(self, args: list) -> None:
+        """Экспортировать сохранение в читаемый JSON (для отладки)"""
+        filename = args[0] if args else "xss_save_export.json"
+
+        if not game_state.export_game(filename):
+            return
+
+        if hasattr(self, 'mission_event_manager'):
+            base, ext = os.path.splitext(filename)
+            advanced_filename = f"{base}_advanced{ext or '.json'}"
+            try:
+                with open(advanced_filename, "w", encoding="utf-8") as f:
+                    json.dump(self._collect_advanced_data(), f, ensure_ascii=False, indent=2, default=str)
+                print(f"{XSSColors.SUCCESS}✅ Продвинутые данные экспортированы в {advanced_filename}{XSSColors.RESET}")
+            except OSError as e:
+                print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Не удалось экспортировать продвинутые данные: {e}{XSSColors.RESET}")
+
+    def _apply_advanced_data(self, advanced_data: dict) -> None:
+        """Восстанавливает состояние продвинутых систем из данных сохранения"""
+        # Восстанавливаем статистику
+        if "mission_statistics" in advanced_data:
+            mission_statistics.stats.update(advanced_data["mission_statistics"])
+            mission_statistics.mark_dirty()
+
+        if "mission_history" in advanced_data:
+            mission_statistics.load_history(advanced_data["mission_history"],
+                                            advanced_data.get("mission_aggregates"))
+
+        # Восстанавливаем активные миссии
+        if "active_teams" in advanced_data:
+            mission_system.active_teams.update(advanced_data["active_teams"])
+
+        if "mission_timers" in advanced_data:
+            mission_system.mission_timers.update(
+                (mission_id, tuple(timer)) for mission_id, timer in advanced_data["mission_timers"].items()
+            )
+            mission_system.timer_warnings.update(advanced_data.get("mission_timer_warnings", {}))
+            mission_system.reschedule_timers()
+
+        if "mission_events" in advanced_data:
+            mission_system.mission_events.update(advanced_data["mission_events"])
+
     def _load_advanced_data(self) -> None:
         """Загружает данные продвинутых систем"""
+        # Из хранилища слотов секция восстанавливается вместе с основным сохранением
+        if game_state.save_store is not None:
+            return
+
         try:
             if os.path.exists("advanced_save.json"):
-                with open("advanced_save.json", "r", encoding="utf-8") as f:
-                    advanced_data = json.load(f)
+                if save_format.is_binary_file("advanced_save.json"):
+                    advanced_data = save_format.read_file("advanced_save.json")
+                else:
+                    with open("advanced_save.json", "r", encoding="utf-8") as f:
+                        advanced_data = json.load(f)
+
+                self._apply_advanced_data(advanced_data)
+                print(f"{XSSColors.SUCCESS}✅ Продвинутые данные загружены{XSSColors.RESET}")
+
+        except Exception as e:
+            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Не удалось загрузить продвинутые данные: {e}{XSSColors.RESET}")
 
-                # Восстанавливаем статистику
-                if "mission_statistics" in advanced_data:
-                    mission_statistics.stats.update(advanced_data["mission_statistics"])
 
-                if "mission_history" in advanced_data:
-                    mission_statistics.mission_history = advanced_data["mission_history"]
+def _parse_args(argv: list) -> argparse.Namespace:
+    """Аргументы командной строки: запись и воспроизведение сессий"""
+    parser = argparse.ArgumentParser(description="XSS Game")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="TRACE", help="записать ввод и seed сессии в файл трассы")
+    group.add_argument("--replay", metavar="TRACE", help="воспроизвести трассу без игрока на полной скорости")
+    parser.add_argument("--seed", type=int, help="зерно случайных чисел для записи")
+    parser.add_argument("--bench-network", nargs="?", const="10000,100000,1000000", metavar="SIZES",
+                        help="замерить процедурную сеть на размерах через запятую и выйти")
+    return parser.parse_args(argv)
 
-                # Восстанавливаем активные миссии
-                if "active_teams" in advanced_data:
-                    mission_system.active_teams.update(advanced_data["active_teams"])
 
-                if "mission_timers" in advanced_data:
-                    mission_system.mission_timers.update(advanced_data["mission_timers"])
+def _bench_network(sizes: str, seed: int = 0) -> None:
+    """Замер генерации, карты, маршрутов и сканирования процедурной сети"""
+    from systems.network_world import benchmark
 
-                if "mission_events" in advanced_data:
-                    mission_system.mission_events.update(advanced_data["mission_events"])
+    columns = ("nodes", "links", "generate_ms", "map_ms", "map_nodes", "route_ms", "route_hops", "scan_ms", "scan_nodes")
+    print("  ".join(f"{name:>11}" for name in columns))
+    for row in benchmark([int(size) for size in sizes.split(",")], seed):
+        print("  ".join(f"{row[name]:>11}" for name in columns))
 
-                print(f"{XSSColors.SUCCESS}✅ Продвинутые данные загружены{XSSColors.RESET}")
 
-        except Exception as e:
-            print(f"{XSSColors.WARNING}[ПРЕДУПРЕЖДЕНИЕ] Не удалось загрузить продвинутые данные: {e}{XSSColors.RESET}")
+def _report_replay(started: float, turns: int) -> None:
+    """Итоги воспроизведения: пропускная способность ходов"""
+    elapsed = time.perf_counter() - started
+    rate = turns / elapsed if elapsed > 0 else 0.0
+    print(f"\n[*] Воспроизведено: {session_recorder.inputs_read} строк ввода, "
+          f"{turns} ходов за {elapsed:.3f} с ({rate:.1f} ходов/с)")
 
 
 def main():
@@ -1753,9 +1980,26 @@ def main():
             print(f"[!] Установите их командой: pip install {' '.join(missing_modules)}")
             return
 
+        args = _parse_args(sys.argv[1:])
+        if args.bench_network:
+            _bench_network(args.bench_network, args.seed or 0)
+            return
+        if args.replay:
+            seed = session_recorder.start_replay(args.replay)
+            print(f"[*] Воспроизведение {args.replay} (seed={seed})")
+        elif args.record:
+            seed = session_recorder.start_recording(args.record, args.seed)
+            print(f"[*] Запись сессии в {args.record} (seed={seed})")
+
         # Запускаем игру
         game = XSSGame()
-        game.run()
+        started = time.perf_counter()
+        try:
+            game.run()
+        finally:
+            if session_recorder.mode == "replay":
+                _report_replay(started, game.turns_played)
+            session_recorder.stop()
 
     except KeyboardInterrupt:
         print(f"\n{XSSColors.WARNING}Игра прервана пользователем.{XSSColors.RESET}")
@@ -0,0 +1,191 @@
+"""
+Выдача достижений по правилам из каталога ACHIEVEMENTS
+"""
+
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from ui.colors import XSSColors
+from core.game_state import game_state
+from core.session import session_system, resolve
+from config.game_data import ACHIEVEMENTS
+from systems.audio import audio_system
+from systems.event_system import event_system, FactionReputationChangedEvent
+
+Predicate = Callable[[], bool]
+
+# Производные счетчики для правил, которые не выражаются текущим значением статистики
+USD_SPENT_STAT = "usd_spent"
+CLEAN_STREAK_STAT = "missions_without_warnings"
+
+
+def _threshold(read: Callable[[], float], rule: dict) -> Predicate:
+    low = rule.get("min")
+    high = rule.get("max")
+    if high is None:
+        return lambda: read() >= low
+    if low is None:
+        return lambda: read() <= high
+    return lambda: low <= read() <= high
+
+
+def compile_condition(condition: Any) -> Tuple[Predicate, Set[str]]:
+    """Правило -> (предикат, ключи изменений, от которых он зависит)"""
+    if isinstance(condition, list):
+        compiled = [compile_condition(rule) for rule in condition]
+        predicates = [predicate for predicate, _ in compiled]
+        dependencies = set().union(*(deps for _, deps in compiled))
+        return (lambda: all(predicate() for predicate in predicates)), dependencies
+
+    if "stat" in condition:
+        key = condition["stat"]
+        return _threshold(lambda: game_state.get_stat(key, 0) or 0, condition), {key}
+    if "count" in condition:
+        key = condition["count"]
+        return _threshold(lambda: len(game_state.get_stat(key, None) or ()), condition), {key}
+    if "skill" in condition:
+        skill = condition["skill"]
+        return _threshold(lambda: game_state.get_skill(skill), condition), {f"skills.{skill}"}
+    if "faction_reputation" in condition:
+        from gameplay.factions import faction_system
+        faction_id = condition["faction_reputation"]
+        return (_threshold(lambda: faction_system.faction_reputation.get(faction_id, 0), condition),
+                {f"faction.{faction_id}"})
+    raise ValueError(f"Неизвестное правило достижения: {condition}")
+
+
+def compile_catalog(catalog: Dict[str, dict]) -> Tuple[Dict[str, Predicate], Dict[str, List[str]]]:
+    """Предикаты достижений и индекс: ключ изменения -> зависящие от него достижения"""
+    rules: Dict[str, Predicate] = {}
+    index: Dict[str, List[str]] = {}
+    for achievement_id, data in catalog.items():
+        if "condition" not in data:
+            continue  # Выдается вручную (секретные и событийные достижения)
+        predicate, dependencies = compile_condition(data["condition"])
+        rules[achievement_id] = predicate
+        for key in dependencies:
+            index.setdefault(key, []).append(achievement_id)
+    return rules, index
+
+
+def change_key(op: str, key: str) -> str:
+    """Ключ зависимости для изменения GameState"""
+    return f"skills.{key}" if op == "skill" else key
+
+
+class AchievementEngine:
+    """Проверяет только достижения, зависящие от изменившегося ключа.
+
+    Подписывается на изменения GameState; фракции приходят через шину
+    событий. Стоимость проверки пропорциональна числу правил, зависящих
+    от изменения, а не размеру каталога.
+    """
+
+    def __init__(self, catalog: Dict[str, dict] = ACHIEVEMENTS):
+        self.catalog = catalog
+        self.rules, self.index = compile_catalog(catalog)
+        self._pending: List[str] = []
+        self._evaluating = False
+        self._silent = False
+        self._remember_balances()
+        resolve(game_state).add_change_listener(self.on_state_change)
+
+    def _remember_balances(self) -> None:
+        self._last_usd = game_state.get_stat("usd_balance", 0) or 0
+        self._last_warnings = game_state.get_stat("warnings", 0) or 0
+
+    def on_state_change(self, op: str, key: str, value: Any = None) -> None:
+        if op == "load":
+            self._remember_balances()
+            self.evaluate_all(silent=True)
+            return
+        self._track_derived(op, key, value)
+        self.notify(change_key(op, key))
+
+    def _track_derived(self, op: str, key: str, value: Any) -> None:
+        """Ведет производные счетчики: потраченные USD и миссии без предупреждений"""
+        if op == "set" and key == "usd_balance":
+            spent = self._last_usd - (value or 0)
+            self._last_usd = value or 0
+            if spent > 0:
+                game_state.modify_stat(USD_SPENT_STAT, spent)
+        elif op == "set" and key == "warnings":
+            raised = (value or 0) > self._last_warnings
+            self._last_warnings = value or 0
+            if raised:
+                game_state.set_stat(CLEAN_STREAK_STAT, 0)
+        elif op == "add" and key == "completed_missions":
+            game_state.modify_stat(CLEAN_STREAK_STAT, 1)
+
+    def notify(self, dependency: str) -> None:
+        """Изменился ключ dependency - проверить зависящие от него достижения"""
+        achievement_ids = self.index.get(dependency)
+        if not achievement_ids:
+            return
+        self._pending.extend(achievement_ids)
+        self._drain()
+
+    def evaluate_all(self, silent: bool = False) -> None:
+        """Полная проверка каталога.
+
+        silent - уже выполненные условия (загрузка сохранения, запуск)
+        отмечаются без объявления и наград.
+        """
+        self._pending.extend(self.rules)
+        self._silent = silent
+        try:
+            self._drain()
+        finally:
+            self._silent = False
+
+    def _drain(self) -> None:
+        # Награды сами меняют статистику - повторный вход только пополняет очередь
+        if self._evaluating:
+            return
+        self._evaluating = True
+        try:
+            while self._pending:
+                achievement_id = self._pending.pop()
+                if not game_state.has_achievement(achievement_id) and self.rules[achievement_id]():
+                    self.grant(achievement_id)
+        finally:
+            self._evaluating = False
+
+    def grant(self, achievement_id: str) -> bool:
+        """Выдает достижение и награды за него"""
+        if not game_state.add_achievement(achievement_id):
+            return False
+        if self._silent:
+            return True
+
+        data = self.catalog.get(achievement_id, {})
+        audio_system.play_sound("achievement")
+        print(f"\n{XSSColors.SUCCESS}{data.get('icon', '🏆')} ДОСТИЖЕНИЕ: {data.get('name', achievement_id)}{XSSColors.RESET}")
+        print(f"   {data.get('desc', '')}")
+
+        if data.get("reward_rep"):
+            game_state.modify_stat("reputation", data["reward_rep"])
+        if data.get("reward_btc"):
+            game_state.earn_currency(data["reward_btc"], "btc_balance")
+        for item_id in data.get("reward_items", []):
+            game_state.add_to_inventory(item_id)
+        for contact_id in data.get("reward_contacts", []):
+            game_state.add_contact(contact_id)
+        for skill, amount in data.get("reward_skills", {}).items():
+            skills = game_state.get_stat("skills", {}) if skill == "all" else [skill]
+            for name in list(skills):
+                game_state.modify_skill(name, amount)
+        return True
+
+
+def handle_faction_reputation_changed(event: FactionReputationChangedEvent):
+    achievement_engine.notify(f"faction.{event.data['faction_id']}")
+
+
+def register_achievement_handlers():
+    """Регистрирует обработчики событий и подключает движок текущей сессии"""
+    event_system.register_listener(FactionReputationChangedEvent, handle_faction_reputation_changed)
+    achievement_engine.evaluate_all(silent=True)
+
+
+# Движок достижений текущей сессии (см. core/session.py)
+achievement_engine = session_system("achievement_engine", AchievementEngine)
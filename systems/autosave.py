@@ -0,0 +1,178 @@
+"""
+Фоновое автосохранение для XSS Game
+"""
+
+import contextvars
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import GAME_SETTINGS
+from core.game_state import game_state
+from core.save_json import CachedJSON
+from ui.colors import XSSColors
+
+# Секция основного сохранения - в режиме журнала ее пишет сам журнал
+GAME_STATE_SECTION = "game_state"
+
+
+def snapshot_copy(value: Any) -> Any:
+    """Быстрая структурная копия данных сохранения.
+
+    Копирует только контейнеры; строки, числа и готовые JSON-фрагменты
+    неизменяемы и разделяются со снимком, поэтому копия обходится дешевле
+    copy.deepcopy.
+    """
+    if isinstance(value, CachedJSON):
+        return value
+    if isinstance(value, dict):
+        return {key: snapshot_copy(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [snapshot_copy(item) for item in value]
+    if hasattr(value, 'to_dict') and callable(getattr(value, 'to_dict')):
+        return snapshot_copy(value.to_dict())
+    return value
+
+
+class AutosaveService:
+    """Автосохранение в фоновом потоке со схлопыванием запросов"""
+
+    def __init__(self, frequency: Optional[int] = None):
+        self.frequency = GAME_SETTINGS['autosave_frequency'] if frequency is None else frequency
+        self._sections: List[Tuple[str, Callable[[], Any], Callable[[Any], None]]] = []
+        self._condition = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._writing = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.saves_written = 0
+        self.saves_coalesced = 0
+        self.last_error: Optional[Exception] = None
+
+    def register_section(self, name: str, snapshot: Callable[[], Any], writer: Callable[[Any], None]) -> None:
+        """Регистрирует секцию: snapshot вызывается на ходу игрока, writer - в фоне"""
+        self._sections.append((name, snapshot, writer))
+
+    def start(self) -> None:
+        """Запускает фоновый поток"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        # Поток пишет системы той сессии, в которой сервис был запущен
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run,), name="xss-autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Дописывает отложенный снимок и останавливает поток"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def on_turn(self, turn: int) -> bool:
+        """Вызывается на границе хода; запрашивает сохранение раз в N ходов"""
+        if self.frequency <= 0 or turn % self.frequency != 0:
+            return False
+        if not game_state.get_stat("autosave_enabled", True):
+            return False
+        return self.request_save()
+
+    def request_save(self) -> bool:
+        """Снимает копию состояния и передает ее фоновому потоку"""
+        sections = self._sections
+
+        # В режиме журнала сохранение и так стоит O(изменений) - пишем сразу,
+        # а редкое уплотнение делаем на основном потоке вместе с журналом
+        journal = game_state.journal
+        if journal is not None:
+            try:
+                if journal.should_compact():
+                    game_state.save_game()
+                else:
+                    game_state.flush_journal()
+            except Exception as e:
+                self.last_error = e
+            sections = [section for section in sections if section[0] != GAME_STATE_SECTION]
+
+        snapshot = {}
+        for name, take_snapshot, _ in sections:
+            try:
+                snapshot[name] = take_snapshot()
+            except Exception as e:
+                self.last_error = e
+                print(f"{XSSColors.WARNING}[АВТОСОХРАНЕНИЕ] Секция {name} пропущена: {e}{XSSColors.RESET}")
+
+        with self._condition:
+            if self._pending is not None:
+                # Диск не успевает - старый снимок заменяется новым
+                self.saves_coalesced += 1
+            self._pending = snapshot
+            self._condition.notify()
+
+        if self._thread is None:
+            self.start()
+        return True
+
+    def cancel_pending(self, timeout: float = 10.0) -> bool:
+        """Отменяет еще не записанный снимок и ждет окончания текущей записи.
+
+        Вызывается перед сохранением на основном потоке: снимок старее
+        этого сохранения не должен записаться после него.
+        """
+        with self._condition:
+            self._pending = None
+        return self.wait_idle(timeout)
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Ждет, пока фоновый поток запишет все снимки"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def _run(self) -> None:
+        """Цикл фонового потока"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._stopping)
+                if self._pending is None and self._stopping:
+                    return
+                snapshot = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                for name, _, writer in self._sections:
+                    if name in snapshot:
+                        writer(snapshot[name])
+                self.saves_written += 1
+            except Exception as e:
+                # Ошибки диска не должны останавливать игру
+                self.last_error = e
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+
+def register_game_state(service: AutosaveService, filename: Optional[str] = None) -> None:
+    """Регистрирует сохранение GameState и NetworkSystem в сервисе"""
+    game_state.add_save_barrier(service.cancel_pending)
+
+    if game_state.save_store is not None and filename is None:
+        # Хранилище слотов: все зарегистрированные секции одной транзакцией
+        service.register_section(
+            GAME_STATE_SECTION,
+            lambda: snapshot_copy(game_state.build_store_sections()),
+            game_state.write_store_sections
+        )
+        return
+
+    filename = filename or game_state.save_file
+
+    service.register_section(
+        GAME_STATE_SECTION,
+        lambda: snapshot_copy(game_state.build_save_data()),
+        lambda save_data: game_state.write_save_data(save_data, filename)
+    )
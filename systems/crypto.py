@@ -2,23 +2,27 @@
 Система криптовалютной биржи для XSS Game
 """
 
-import random
 import time
 from typing import Dict, Optional
 
 from ui.colors import XSSColors as Colors
 from ui.effects import format_currency
 from core.game_state import game_state
+from core.session import session_system
 from systems.audio import audio_system
 from config.game_data import CRYPTO_DATA
 from systems.event_system import event_system, CryptoMarketChangeEvent
+from core.replay import rng_stream
+
+random = rng_stream("crypto")
 
 
 class CryptoSystem:
     """Система управления криптовалютной биржей"""
     
     def __init__(self):
-        self.crypto_data = CRYPTO_DATA.copy()
+        # Цены меняются, поэтому у каждой сессии свои копии записей каталога
+        self.crypto_data = {symbol: data.copy() for symbol, data in CRYPTO_DATA.items()}
         self.price_history = {symbol: [] for symbol in self.crypto_data.keys()}
         self.market_volatility = 0.05  # 5% базовая волатильность
     
@@ -628,5 +632,5 @@ class CryptoSystem:
             print(f"{Colors.INFO}📊 Рынок стабилизировался{Colors.RESET}")
 
 
-# Глобальный экземпляр системы криптовалют
-crypto_system = CryptoSystem()
\ No newline at end of file
+# Экземпляр системы криптовалют текущей сессии (см. core/session.py)
+crypto_system = session_system("crypto_system", CryptoSystem)
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Инструментирование системы событий: счетчики доставки и задержки слушателей
+"""
+
+import collections
+import time
+from typing import Any, Callable, Dict
+
+
+def listener_name(listener: Callable) -> str:
+    """Читаемое имя слушателя: модуль и qualname"""
+    name = getattr(listener, "__qualname__", None) or getattr(listener, "__name__", None) or repr(listener)
+    module = getattr(listener, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+class ListenerStats:
+    """Вызовы, суммарная и максимальная задержка, ошибки одного слушателя"""
+
+    __slots__ = ("calls", "total_time", "max_time", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total_time * 1000, 3),
+            "avg_ms": round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_time * 1000, 3),
+            "errors": self.errors,
+        }
+
+
+class EventMetrics:
+    """Метрики системы событий.
+
+    Ошибки слушателей считаются всегда; время и счетчики доставки -
+    только при enabled, чтобы выключенный профайлер не стоил ничего.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at = time.time()
+        self.dispatch_counts: Dict[str, int] = collections.Counter()
+        self.listeners: Dict[str, ListenerStats] = {}
+
+    def reset(self) -> None:
+        self.started_at = time.time()
+        self.dispatch_counts.clear()
+        self.listeners.clear()
+
+    def _stats(self, listener: Callable) -> ListenerStats:
+        name = listener_name(listener)
+        stats = self.listeners.get(name)
+        if stats is None:
+            stats = self.listeners[name] = ListenerStats()
+        return stats
+
+    def record_dispatch(self, event_type: str) -> None:
+        self.dispatch_counts[event_type] += 1
+
+    def record_call(self, listener: Callable, elapsed: float, failed: bool = False) -> None:
+        stats = self._stats(listener)
+        stats.calls += 1
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        if failed:
+            stats.errors += 1
+
+    def record_error(self, listener: Callable) -> None:
+        self._stats(listener).errors += 1
+
+    def call(self, listener: Callable, *args, **kwargs) -> Any:
+        """Вызывает слушателя с замером времени (исключение пробрасывается)"""
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = listener(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self.record_call(listener, time.perf_counter() - started, failed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Метрики для вывода в JSON; слушатели - по убыванию суммарного времени"""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        total = sum(self.dispatch_counts.values())
+        listeners = sorted(self.listeners.items(), key=lambda item: item[1].total_time, reverse=True)
+        return {
+            "enabled": self.enabled,
+            "window_s": round(elapsed, 3),
+            "events_dispatched": total,
+            "events_per_s": round(total / elapsed, 3),
+            "dispatch_counts": dict(self.dispatch_counts.most_common()),
+            "listeners": {name: stats.to_dict() for name, stats in listeners},
+        }
@@ -1,8 +1,17 @@
 import collections
-from typing import Callable, Any, Dict, Type
+import heapq
+import inspect
+import itertools
+import json
+from typing import Callable, Any, Dict, Hashable, List, Optional, Tuple, Type
 import time
+import weakref
 from ui.colors import XSSColors
 from core.game_state import game_state
+from core.save_json import CachedJSON, GameJSONEncoder
+from systems.running_stats import OutcomeStats, P2Quantile, RunningStats
+from systems.mission_history import MissionHistory
+from systems.event_metrics import EventMetrics
 class Event:
     """Базовый класс для всех событий в игре."""
     def __init__(self, event_type: str, data: Dict[str, Any] = None):
@@ -12,6 +21,14 @@ class Event:
     def __repr__(self):
         return f"<{self.event_type} Event: {self.data}>"
 
+    def coalesce_key(self) -> Optional[Hashable]:
+        """Ключ объединения в отложенном режиме; None - событие не объединяется."""
+        return None
+
+    def merge(self, newer: "Event") -> "Event":
+        """Объединяет событие с более поздним событием того же ключа."""
+        return newer
+
 # --- Примеры конкретных типов событий ---
 class MissionCompletedEvent(Event):
     """Событие завершения миссии."""
@@ -42,6 +59,25 @@ class CryptoMarketChangeEvent(Event):
             "change_percent": change_percent
         })
 
+    def coalesce_key(self) -> Optional[Hashable]:
+        return (self.event_type, self.data["symbol"])
+
+    def merge(self, newer: Event) -> Event:
+        """Чистое изменение цены: от первой старой цены до последней новой."""
+        old_price = self.data["old_price"]
+        new_price = newer.data["new_price"]
+        change_percent = ((new_price - old_price) / old_price) * 100 if old_price > 0 else 0
+        return CryptoMarketChangeEvent(self.data["symbol"], old_price, new_price, change_percent)
+
+class FactionReputationChangedEvent(Event):
+    """Событие изменения репутации во фракции."""
+    def __init__(self, faction_id: str, old_reputation: int, new_reputation: int):
+        super().__init__("FactionReputationChanged", {
+            "faction_id": faction_id,
+            "old_reputation": old_reputation,
+            "new_reputation": new_reputation
+        })
+
 class PlayerNotificationEvent(Event):
     """Событие для отображения уведомления игроку."""
     def __init__(self, message: str, message_type: str = "info", duration: float = 3.0):
@@ -51,6 +87,50 @@ class PlayerNotificationEvent(Event):
             "duration": duration
         })
 
+class _StrongListener:
+    """Сильная ссылка на слушателя (функции, лямбды)"""
+    __slots__ = ("listener",)
+
+    def __init__(self, listener: Callable[[Event], None]):
+        self.listener = listener
+
+    def __call__(self) -> Callable[[Event], None]:
+        return self.listener
+
+
+class _WeakListener:
+    """Слабая ссылка на связанный метод; не продлевает жизнь его объекта"""
+    __slots__ = ("ref",)
+
+    def __init__(self, listener: Callable[[Event], None], on_dead: Callable):
+        self.ref = weakref.WeakMethod(listener, on_dead)
+
+    def __call__(self) -> Optional[Callable[[Event], None]]:
+        return self.ref()
+
+
+class Subscription:
+    """Handle подписки: unsubscribe() или блок with для ограниченной подписки"""
+
+    def __init__(self, system: "EventSystem", event_type: Type[Event], ref):
+        self._system = system
+        self.event_type = event_type
+        self._ref = ref
+
+    @property
+    def active(self) -> bool:
+        return self._ref in self._system._listeners.get(self.event_type, ()) and self._ref() is not None
+
+    def unsubscribe(self) -> None:
+        self._system._remove_ref(self.event_type, self._ref)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.unsubscribe()
+
+
 class EventSystem:
     """Центральный диспетчер событий."""
     _instance = None
@@ -59,28 +139,131 @@ class EventSystem:
         if cls._instance is None:
             cls._instance = super(EventSystem, cls).__new__(cls)
             cls._instance._listeners = collections.defaultdict(list)
+            # Кэш: конкретный тип события -> слушатели по его MRO
+            cls._instance._dispatch_table = {}
+            # Отложенный режим: очередь событий до конца хода
+            cls._instance._deferred = False
+            cls._instance._queue = {}
+            cls._instance._queue_seq = 0
+            # Профилирование слушателей (включается через enable_profiling)
+            cls._instance.metrics = EventMetrics()
         return cls._instance
 
-    def register_listener(self, event_type: Type[Event], listener: Callable[[Event], None]):
-        """Регистрирует слушателя для определенного типа события."""
+    def register_listener(self, event_type: Type[Event], listener: Callable[[Event], None],
+                          weak: Optional[bool] = None) -> "Subscription":
+        """Регистрирует слушателя для определенного типа события (и его подклассов).
+
+        Связанные методы по умолчанию хранятся по слабой ссылке: когда объект
+        умирает, подписка удаляется сама. Возвращает handle для отписки.
+        """
         if not issubclass(event_type, Event):
             raise ValueError("event_type должен быть подклассом Event")
-        self._listeners[event_type].append(listener)
+
+        listeners = self._listeners[event_type]
+        for ref in listeners:
+            if ref() == listener:
+                # Повторная регистрация не дублирует доставку
+                return Subscription(self, event_type, ref)
+
+        if weak is None:
+            weak = inspect.ismethod(listener)
+        if weak:
+            ref = _WeakListener(listener, lambda dead_ref: self._prune(event_type, dead_ref))
+        else:
+            ref = _StrongListener(listener)
+        listeners.append(ref)
+        self._dispatch_table.clear()
         # print(f"[EventSystem] Слушатель {listener.__name__} зарегистрирован для {event_type.__name__}")
+        return Subscription(self, event_type, ref)
 
     def unregister_listener(self, event_type: Type[Event], listener: Callable[[Event], None]):
         """Отменяет регистрацию слушателя."""
-        if listener in self._listeners[event_type]:
-            self._listeners[event_type].remove(listener)
-            # print(f"[EventSystem] Слушатель {listener.__name__} отменен для {event_type.__name__}")
+        for ref in self._listeners.get(event_type, ()):
+            if ref() == listener:
+                self._remove_ref(event_type, ref)
+                # print(f"[EventSystem] Слушатель {listener.__name__} отменен для {event_type.__name__}")
+                return
+
+    def _remove_ref(self, event_type: Type[Event], ref) -> None:
+        listeners = self._listeners.get(event_type)
+        if listeners and ref in listeners:
+            listeners.remove(ref)
+            if not listeners:
+                del self._listeners[event_type]
+            self._dispatch_table.clear()
+
+    def _prune(self, event_type: Type[Event], dead_ref) -> None:
+        """Колбэк слабой ссылки: объект слушателя собран сборщиком мусора"""
+        listeners = self._listeners.get(event_type, ())
+        for ref in listeners:
+            if ref is dead_ref or getattr(ref, "ref", None) is dead_ref:
+                self._remove_ref(event_type, ref)
+                return
+
+    def _resolve_listeners(self, event_cls: type) -> Tuple[Any, ...]:
+        """Ссылки на слушателей для типа события: сначала самого типа, затем базовых классов."""
+        listeners = self._dispatch_table.get(event_cls)
+        if listeners is None:
+            resolved = []
+            for klass in event_cls.__mro__:
+                resolved.extend(self._listeners.get(klass, ()))
+            listeners = tuple(resolved)
+            self._dispatch_table[event_cls] = listeners
+        return listeners
+
+    def set_deferred(self, deferred: bool):
+        """Включает отложенную доставку: события копятся до flush()."""
+        self._deferred = deferred
+        if not deferred:
+            self.flush()
 
     def dispatch(self, event: Event):
         """Отправляет событие всем зарегистрированным слушателям."""
         # print(f"[EventSystem] Отправка события: {event}")
-        for listener in self._listeners[type(event)]:
+        if self._deferred:
+            self._enqueue(event)
+        else:
+            self._deliver(event)
+
+    def _enqueue(self, event: Event):
+        """Ставит событие в очередь, объединяя его с событием того же ключа."""
+        key = event.coalesce_key()
+        if key is None:
+            self._queue_seq += 1
+            key = ("__seq__", self._queue_seq)
+        queued = self._queue.get(key)
+        # Объединенное событие сохраняет место первого в очереди
+        self._queue[key] = queued.merge(event) if queued is not None else event
+
+    def flush(self):
+        """Доставляет накопленные события в порядке поступления."""
+        # События, отправленные слушателями во время доставки, доставляются в этом же сбросе
+        while self._queue:
+            queue, self._queue = self._queue, {}
+            for event in queue.values():
+                self._deliver(event)
+
+    def enable_profiling(self, enabled: bool = True):
+        """Включает замер задержек слушателей и счетчики доставки."""
+        self.metrics.enabled = enabled
+
+    def _deliver(self, event: Event):
+        metrics = self.metrics
+        if metrics.enabled:
+            metrics.record_dispatch(event.event_type)
+        for ref in self._resolve_listeners(type(event)):
+            listener = ref()
+            if listener is None:
+                # Объект слушателя уже умер - колбэк слабой ссылки уберет запись
+                continue
             try:
-                listener(event)
+                if metrics.enabled:
+                    metrics.call(listener, event)
+                else:
+                    listener(event)
             except Exception as e:
+                if not metrics.enabled:
+                    metrics.record_error(listener)
                 print(f"[{event.event_type} EventSystem ERROR] Ошибка в слушателе {listener.__name__}: {e}")
 
 
@@ -150,6 +333,30 @@ class RandomMissionEvent(Event):
         })
 
 
+class WorldEventStartedEvent(Event):
+    """Начало глобального события из каталога RANDOM_EVENTS"""
+
+    def __init__(self, event_id: str, name: str, headline: str, effects: dict, expires_turn: int):
+        super().__init__("WorldEventStarted", {
+            "event_id": event_id,
+            "name": name,
+            "headline": headline,
+            "effects": effects,
+            "expires_turn": expires_turn
+        })
+
+
+class WorldEventEndedEvent(Event):
+    """Окончание глобального события"""
+
+    def __init__(self, event_id: str, name: str, effects: dict):
+        super().__init__("WorldEventEnded", {
+            "event_id": event_id,
+            "name": name,
+            "effects": effects
+        })
+
+
 class TeamSynergyChangedEvent(Event):
     """Изменение синергии команды"""
 
@@ -318,9 +525,23 @@ def register_mission_event_handlers():
 class MissionNotificationSystem:
     """Система уведомлений для миссий"""
 
+    HISTORY_LIMIT = 200
+    PRIORITIES = ("high", "normal", "low")
+
     def __init__(self):
-        self.active_notifications = []
-        self.notification_history = []
+        # История ограничена: старые записи вытесняются новыми
+        self.notification_history = collections.deque(maxlen=self.HISTORY_LIMIT)
+        # Активные уведомления: куча (время истечения, id, приоритет) и индекс по приоритету
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._by_priority: Dict[str, Dict[int, Dict[str, Any]]] = {p: {} for p in self.PRIORITIES}
+        self._next_id = 0
+
+    @property
+    def active_notifications(self) -> List[Dict[str, Any]]:
+        """Активные уведомления в порядке поступления"""
+        active = [n for bucket in self._by_priority.values() for n in bucket.values()]
+        active.sort(key=lambda n: n["id"])
+        return active
 
     def add_notification(self, notification_type: str, message: str,
                          priority: str = "normal", duration: int = 10):
@@ -331,16 +552,23 @@ class MissionNotificationSystem:
             "priority": priority,
             "timestamp": time.time(),
             "duration": duration,
-            "id": len(self.notification_history)
+            "id": self._next_id
         }
+        self._next_id += 1
 
-        self.active_notifications.append(notification)
+        self._by_priority.setdefault(priority, {})[notification["id"]] = notification
+        heapq.heappush(self._expiry_heap, (notification["timestamp"] + duration, notification["id"], priority))
         self.notification_history.append(notification)
 
         # Показываем уведомление немедленно для высокого приоритета
         if priority == "high":
             self._display_notification(notification)
 
+    def get_notifications_by_priority(self, priority: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Первые limit активных уведомлений заданного приоритета"""
+        bucket = self._by_priority.get(priority, {})
+        return list(itertools.islice(bucket.values(), limit))
+
     def _display_notification(self, notification):
         """Отображает уведомление"""
         from ui.colors import XSSColors
@@ -370,28 +598,31 @@ class MissionNotificationSystem:
         """Обновляет активные уведомления"""
         current_time = time.time()
 
-        # Удаляем устаревшие уведомления
-        self.active_notifications = [
-            n for n in self.active_notifications
-            if current_time - n["timestamp"] < n["duration"]
-        ]
+        # Удаляем устаревшие уведомления: только те, что на вершине кучи
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= current_time:
+            _, notification_id, priority = heapq.heappop(heap)
+            self._by_priority.get(priority, {}).pop(notification_id, None)
 
     def show_active_notifications(self):
         """Показывает все активные уведомления"""
         from ui.colors import XSSColors
 
-        if not self.active_notifications:
+        if not any(self._by_priority.values()):
             print(f"{XSSColors.INFO}Нет активных уведомлений{XSSColors.RESET}")
             return
 
         print(f"\n{XSSColors.HEADER}━━━━━━━━━━━━━━━━ АКТИВНЫЕ УВЕДОМЛЕНИЯ ━━━━━━━━━━━━━━━━{XSSColors.RESET}")
 
-        for notification in sorted(self.active_notifications, key=lambda x: x["priority"], reverse=True):
-            self._display_notification(notification)
+        for bucket in self._by_priority.values():
+            for notification in bucket.values():
+                self._display_notification(notification)
 
     def clear_all_notifications(self):
         """Очищает все уведомления"""
-        self.active_notifications.clear()
+        for bucket in self._by_priority.values():
+            bucket.clear()
+        self._expiry_heap.clear()
         print(f"{XSSColors.SUCCESS}✅ Все уведомления очищены{XSSColors.RESET}")
 
 
@@ -423,7 +654,11 @@ class MissionEventManager:
     def trigger_event(self, event_type: str, **kwargs):
         """Запускает событие"""
         if event_type in self.event_handlers:
-            self.event_handlers[event_type](**kwargs)
+            handler = self.event_handlers[event_type]
+            if event_system.metrics.enabled:
+                event_system.metrics.call(handler, **kwargs)
+            else:
+                handler(**kwargs)
 
         # Отправляем событие через глобальную систему событий
         self._dispatch_global_event(event_type, **kwargs)
@@ -530,32 +765,8 @@ class MissionEventManager:
         )
 
     def check_time_limits(self):
-        """Проверяет временные ограничения активных миссий"""
-        active_mission = game_state.get_stat("active_mission")
-        if not active_mission:
-            return
-
-        if active_mission in self.mission_system.mission_timers:
-            start_time, time_limit = self.mission_system.mission_timers[active_mission]
-            elapsed = (time.time() - start_time) / 3600
-            remaining = time_limit - elapsed
-
-            # Предупреждения о времени
-            if remaining <= 0:
-                self.trigger_event("time_warning",
-                                   mission_id=active_mission,
-                                   time_remaining=0,
-                                   warning_level="expired")
-            elif remaining <= time_limit * 0.1:  # 10% времени
-                self.trigger_event("time_warning",
-                                   mission_id=active_mission,
-                                   time_remaining=remaining,
-                                   warning_level="critical")
-            elif remaining <= time_limit * 0.3:  # 30% времени
-                self.trigger_event("time_warning",
-                                   mission_id=active_mission,
-                                   time_remaining=remaining,
-                                   warning_level="low")
+        """Вызывает наступившие предупреждения о времени (см. MissionSystem.set_mission_timer)"""
+        self.mission_system.poll_timers()
 
 
 # Система статистики миссий
@@ -577,11 +788,19 @@ class MissionStatistics:
             "favorite_faction": None,
             "moral_profile": "Unknown"
         }
-        self.mission_history = []
+        self.mission_history = MissionHistory()
+        self._reset_aggregates()
+
+        # Кэш JSON для сохранений: статистика по поколению изменений,
+        # история - по версии колоночного хранилища
+        self.generation = 0
+        self._stats_fragment: Optional[Tuple[int, CachedJSON]] = None
+        self._history_fragment: Optional[Tuple[MissionHistory, int, CachedJSON]] = None
 
     def record_mission_completion(self, mission_id: str, mission_data: dict,
                                   completion_time: float, rewards: dict):
         """Записывает завершение миссии"""
+        self.generation += 1
         self.stats["missions_completed"] += 1
         self.stats["total_btc_earned"] += rewards.get("btc", 0)
         self.stats["total_reputation_gained"] += rewards.get("reputation", 0)
@@ -592,39 +811,72 @@ class MissionStatistics:
         if "time_limit" in mission_data:
             self.stats["time_critical_missions"] += 1
 
+        self._aggregate_completion(mission_id, mission_data.get("type", "normal"), completion_time)
+
         # Записываем в историю
-        self.mission_history.append({
-            "mission_id": mission_id,
-            "completion_time": completion_time,
-            "rewards": rewards,
-            "timestamp": time.time(),
-            "success": True
-        })
+        self.mission_history.record(
+            mission_id, True, time.time(),
+            mission_type=mission_data.get("type", "normal"),
+            btc=rewards.get("btc", 0),
+            reputation=rewards.get("reputation", 0),
+            completion_time=completion_time
+        )
 
         self._update_derived_stats()
 
-    def record_mission_failure(self, mission_id: str, reason: str):
+    def record_mission_failure(self, mission_id: str, reason: str, mission_type: str = "normal"):
         """Записывает провал миссии"""
+        self.generation += 1
         self.stats["missions_failed"] += 1
+        self._aggregate_failure(mission_id, mission_type)
 
-        self.mission_history.append({
-            "mission_id": mission_id,
-            "reason": reason,
-            "timestamp": time.time(),
-            "success": False
-        })
+        self.mission_history.record(
+            mission_id, False, time.time(),
+            mission_type=mission_type,
+            reason=reason
+        )
 
         self._update_derived_stats()
 
     def record_stage_completion(self, mission_id: str, stage_name: str):
         """Записывает завершение этапа"""
+        self.generation += 1
         self.stats["stages_completed"] += 1
 
     def record_moral_choice(self, choice_id: str, impact: int):
         """Записывает моральный выбор"""
+        self.generation += 1
         self.stats["moral_choices_made"] += 1
         # Здесь можно добавить анализ морального профиля
 
+    def mark_dirty(self) -> None:
+        """Отметить изменение stats, сделанное в обход методов record_*"""
+        self.generation += 1
+
+    def stats_fragment(self) -> CachedJSON:
+        """Статистика в JSON; кодируется заново только после изменений"""
+        cached = self._stats_fragment
+        if cached is None or cached[0] != self.generation:
+            cached = (self.generation, CachedJSON.encode(self.stats))
+            self._stats_fragment = cached
+        return cached[1]
+
+    def history_fragment(self) -> CachedJSON:
+        """Колонки истории в JSON; кодируются заново только после изменений"""
+        history = self.mission_history
+        cached = self._history_fragment
+        if cached is None or cached[0] is not history or cached[1] != history.version:
+            # Колонки пишутся в одну строку: построчный отступ раздул бы файл
+            text = json.dumps(history.to_dict(), ensure_ascii=False, separators=(",", ":"))
+            cached = (history, history.version, CachedJSON(text))
+            self._history_fragment = cached
+        return cached[2]
+
+    def load_history(self, data: Any, aggregates: Optional[dict] = None):
+        """Восстанавливает историю (колонки или старый список) и агрегаты"""
+        self.mission_history = MissionHistory.from_data(data)
+        self.load_aggregates(aggregates)
+
     def _update_derived_stats(self):
         """Обновляет производные статистики"""
         total_missions = self.stats["missions_completed"] + self.stats["missions_failed"]
@@ -632,10 +884,58 @@ class MissionStatistics:
             self.stats["success_rate"] = (self.stats["missions_completed"] / total_missions) * 100
 
         # Средняя продолжительность миссий
-        successful_missions = [m for m in self.mission_history if m.get("success")]
-        if successful_missions:
-            total_time = sum(m.get("completion_time", 0) for m in successful_missions)
-            self.stats["average_mission_time"] = total_time / len(successful_missions)
+        if self.completion_times.count:
+            self.stats["average_mission_time"] = self.completion_times.mean
+
+    def _reset_aggregates(self):
+        """Пустые потоковые агрегаты"""
+        self.completion_times = RunningStats()
+        self.time_quantiles = {"p50": P2Quantile(0.5), "p95": P2Quantile(0.95)}
+        self.by_mission: Dict[str, OutcomeStats] = {}
+        self.by_type: Dict[str, OutcomeStats] = {}
+
+    def _aggregate_completion(self, mission_id: str, mission_type: str, completion_time: float):
+        """Учитывает успешную миссию в агрегатах за O(1)"""
+        self.completion_times.add(completion_time)
+        for sketch in self.time_quantiles.values():
+            sketch.add(completion_time)
+        for group in (self.by_mission.setdefault(str(mission_id), OutcomeStats()),
+                      self.by_type.setdefault(mission_type, OutcomeStats())):
+            group.completed += 1
+            group.times.add(completion_time)
+
+    def _aggregate_failure(self, mission_id: str, mission_type: str):
+        """Учитывает провал миссии в агрегатах за O(1)"""
+        self.by_mission.setdefault(str(mission_id), OutcomeStats()).failed += 1
+        self.by_type.setdefault(mission_type, OutcomeStats()).failed += 1
+
+    def aggregates_state(self) -> dict:
+        """Агрегаты для сохранения"""
+        return {
+            "completion_times": self.completion_times.to_dict(),
+            "time_quantiles": {name: sketch.to_dict() for name, sketch in self.time_quantiles.items()},
+            "by_mission": {key: group.to_dict() for key, group in self.by_mission.items()},
+            "by_type": {key: group.to_dict() for key, group in self.by_type.items()},
+        }
+
+    def load_aggregates(self, data: Optional[dict]):
+        """Восстанавливает агрегаты; без данных (старое сохранение) - пересчет по истории"""
+        self._reset_aggregates()
+        if not data:
+            for entry in self.mission_history:
+                mission_type = entry.get("mission_type", "normal")
+                if entry.get("success"):
+                    self._aggregate_completion(entry.get("mission_id"), mission_type,
+                                               entry.get("completion_time", 0))
+                else:
+                    self._aggregate_failure(entry.get("mission_id"), mission_type)
+        else:
+            self.completion_times = RunningStats.from_dict(data.get("completion_times", {}))
+            for name, sketch in data.get("time_quantiles", {}).items():
+                self.time_quantiles[name] = P2Quantile.from_dict(sketch)
+            self.by_mission = {key: OutcomeStats.from_dict(group) for key, group in data.get("by_mission", {}).items()}
+            self.by_type = {key: OutcomeStats.from_dict(group) for key, group in data.get("by_type", {}).items()}
+        self.generation += 1
 
     def get_performance_rating(self) -> str:
         """Возвращает рейтинг производительности"""
@@ -681,6 +981,21 @@ class MissionStatistics:
         if self.stats['average_mission_time'] > 0:
             print(f"\n{XSSColors.INFO}⏱️ ВРЕМЯ:{XSSColors.RESET}")
             print(f"   Среднее время миссии: {self.stats['average_mission_time']:.1f} ч")
+            if self.completion_times.count > 1:
+                print(f"   Разброс (σ): {self.completion_times.stddev:.1f} ч")
+            p50 = self.time_quantiles["p50"].value
+            p95 = self.time_quantiles["p95"].value
+            if p50 is not None:
+                print(f"   Медиана (p50): {p50:.1f} ч, p95: {p95:.1f} ч")
+
+        # Разбивка по типам миссий
+        if self.by_type:
+            print(f"\n{XSSColors.INFO}📂 ПО ТИПАМ:{XSSColors.RESET}")
+            for mission_type, group in sorted(self.by_type.items()):
+                line = f"   {mission_type}: {group.completed} ✅ / {group.failed} ❌"
+                if group.times.count:
+                    line += f", среднее время {group.times.mean:.1f} ч"
+                print(line)
 
         print(f"\n{XSSColors.HEADER}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{XSSColors.RESET}")
 
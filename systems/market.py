@@ -2,15 +2,18 @@
 Система магазина для XSS Game
 """
 
-import random
 from typing import Dict, List, Optional
 
 from ui.colors import XSSColors as Colors
 from ui.effects import typing_effect
 from core.game_state import game_state
+from core.session import session_system
 from systems.audio import audio_system
 from config.settings import ITEM_CATEGORIES
 from config.game_data import MARKET_ITEMS
+from core.replay import rng_stream
+
+random = rng_stream("market")
 
 
 class MarketSystem:
@@ -489,5 +492,5 @@ class MarketSystem:
         return total_bonuses
 
 
-# Глобальный экземпляр системы магазина
-market_system = MarketSystem()
\ No newline at end of file
+# Экземпляр системы магазина текущей сессии (см. core/session.py)
+market_system = session_system("market_system", MarketSystem)
\ No newline at end of file
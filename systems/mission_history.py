@@ -0,0 +1,182 @@
+"""
+Колоночное хранилище истории миссий с запросами по времени
+"""
+
+import bisect
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+HISTORY_VERSION = 1
+
+
+class MissionHistory:
+    """История миссий в типизированных колонках.
+
+    Строки упорядочены по времени, поэтому окно времени находится бинарным
+    поиском по колонке timestamp. Идентификаторы миссий, типы и причины
+    провала интернированы в общую таблицу строк. Для старого кода история
+    ведет себя как список словарей: len, индексы, срезы и итерация.
+    """
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+
+        self.timestamps = array("d")
+        self.mission_ids = array("I")
+        self.mission_types = array("I")
+        self.success = array("B")
+        self.btc = array("d")
+        self.reputation = array("d")
+        self.completion_times = array("d")
+        self.reasons = array("I")
+
+        # Меняется при каждом изменении - для кэша сериализации
+        self.version = 0
+
+    def _columns(self):
+        return (self.timestamps, self.mission_ids, self.mission_types, self.success,
+                self.btc, self.reputation, self.completion_times, self.reasons)
+
+    def _intern(self, value: Optional[str]) -> int:
+        value = "" if value is None else str(value)
+        idx = self._string_index.get(value)
+        if idx is None:
+            idx = len(self._strings)
+            self._string_index[value] = idx
+            self._strings.append(value)
+        return idx
+
+    def record(self, mission_id: str, success: bool, timestamp: float, mission_type: str = "normal",
+               btc: float = 0.0, reputation: float = 0.0, completion_time: float = 0.0,
+               reason: Optional[str] = None) -> None:
+        """Добавляет запись; позиция ищется так, чтобы сохранить порядок по времени"""
+        row = (timestamp, self._intern(mission_id), self._intern(mission_type), 1 if success else 0,
+               btc, reputation, completion_time, self._intern(reason))
+
+        if not self.timestamps or timestamp >= self.timestamps[-1]:
+            for column, value in zip(self._columns(), row):
+                column.append(value)
+        else:
+            pos = bisect.bisect_right(self.timestamps, timestamp)
+            for column, value in zip(self._columns(), row):
+                column.insert(pos, value)
+        self.version += 1
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Добавляет запись в старом формате словаря"""
+        rewards = entry.get("rewards") or {}
+        self.record(
+            entry.get("mission_id"),
+            bool(entry.get("success")),
+            entry.get("timestamp", 0.0),
+            mission_type=entry.get("mission_type", "normal"),
+            btc=rewards.get("btc", 0) or 0,
+            reputation=rewards.get("reputation", 0) or 0,
+            completion_time=entry.get("completion_time", 0) or 0,
+            reason=entry.get("reason"),
+        )
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        strings = self._strings
+        row = {
+            "mission_id": strings[self.mission_ids[i]],
+            "mission_type": strings[self.mission_types[i]],
+            "timestamp": self.timestamps[i],
+            "success": bool(self.success[i]),
+        }
+        if row["success"]:
+            row["completion_time"] = self.completion_times[i]
+            row["rewards"] = {"btc": self.btc[i], "reputation": self.reputation[i]}
+        else:
+            row["reason"] = strings[self.reasons[i]]
+        return row
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self.timestamps) > 0
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._row(i) for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("индекс истории вне диапазона")
+        return self._row(item)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def query(self, mission_id: Optional[str] = None, success: Optional[bool] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Записи по миссии, исходу и окну времени [since, until).
+
+        limit - сколько последних подходящих записей вернуть.
+        """
+        start = bisect.bisect_left(self.timestamps, since) if since is not None else 0
+        stop = bisect.bisect_left(self.timestamps, until) if until is not None else len(self)
+
+        mission_ref = None
+        if mission_id is not None:
+            mission_ref = self._string_index.get(str(mission_id))
+            if mission_ref is None:
+                return []
+        success_flag = None if success is None else (1 if success else 0)
+
+        # Идем с конца окна: нужны последние записи
+        matches = []
+        for i in range(stop - 1, start - 1, -1):
+            if mission_ref is not None and self.mission_ids[i] != mission_ref:
+                continue
+            if success_flag is not None and self.success[i] != success_flag:
+                continue
+            matches.append(i)
+            if limit is not None and len(matches) >= limit:
+                break
+        return [self._row(i) for i in reversed(matches)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Колонки для сохранения"""
+        return {
+            "version": HISTORY_VERSION,
+            "strings": list(self._strings),
+            "timestamp": self.timestamps.tolist(),
+            "mission_id": self.mission_ids.tolist(),
+            "mission_type": self.mission_types.tolist(),
+            "success": self.success.tolist(),
+            "btc": self.btc.tolist(),
+            "reputation": self.reputation.tolist(),
+            "completion_time": self.completion_times.tolist(),
+            "reason": self.reasons.tolist(),
+        }
+
+    @classmethod
+    def from_data(cls, data: Any) -> "MissionHistory":
+        """Восстанавливает историю из колонок или из старого списка словарей"""
+        history = cls()
+        if isinstance(data, list):
+            for entry in sorted(data, key=lambda e: e.get("timestamp", 0.0)):
+                history.append(entry)
+            return history
+        if not data:
+            return history
+
+        if data.get("version", 0) > HISTORY_VERSION:
+            raise ValueError("неподдерживаемая версия истории миссий")
+
+        history._strings = list(data["strings"])
+        history._string_index = {value: i for i, value in enumerate(history._strings)}
+        history.timestamps = array("d", data["timestamp"])
+        history.mission_ids = array("I", data["mission_id"])
+        history.mission_types = array("I", data["mission_type"])
+        history.success = array("B", data["success"])
+        history.btc = array("d", data["btc"])
+        history.reputation = array("d", data["reputation"])
+        history.completion_times = array("d", data["completion_time"])
+        history.reasons = array("I", data["reason"])
+        return history
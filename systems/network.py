@@ -2,28 +2,119 @@
 Система сетевых узлов для XSS Game 0.3.1
 """
 
-import random
+import random as _random
 import time
-from typing import Dict, List, Optional, Tuple
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+from config.settings import GAME_SETTINGS
 from ui.colors import XSSColors
 from ui.effects import typing_effect, progress_bar, boxed_text
 from core.game_state import game_state
+from core.session import session_system, resolve
+from core.save_json import CachedJSON
 from systems.audio import audio_system
+from systems.network_graph import NetworkGraph
+from systems.network_world import ProceduralWorld
+from core.replay import rng_stream
+
+random = rng_stream("network")
+
+# Шлюзы процедурного мира, доступные с DNS-серверов базовой сети
+WORLD_ENTRY_POINTS = 4
+
+
+class CodeTable:
+    """Интернированные строки с кодами, общие для всех узлов.
+
+    Набор строк у узлов сети маленький (сервисы, уязвимости, ОС, типы),
+    поэтому узел хранит их байтами кодов вместо списков строк. Если в
+    сохранении встретилось больше 256 разных строк, списки с кодами
+    старше 255 хранятся кортежем самих строк.
+    """
+
+    __slots__ = ("names", "codes")
+
+    def __init__(self, names: Tuple[str, ...] = ()):
+        self.names: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = len(self.names)
+            self.codes[name] = code
+            self.names.append(name)
+        return code
+
+    def encode(self, names) -> Union[bytes, Tuple[str, ...]]:
+        if not names:
+            return b""
+        codes = [self.code(name) for name in names]
+        if max(codes) > 255:
+            return tuple(names)
+        return bytes(codes)
+
+    def decode(self, codes: Union[bytes, Tuple[str, ...]]) -> Tuple[str, ...]:
+        if type(codes) is tuple:
+            return codes
+        names = self.names
+        return tuple(names[code] for code in codes)
+
+
+SERVICE_CODES = CodeTable((
+    "http", "https", "ssh", "ftp", "telnet", "smtp", "dns_service", "tor",
+    "openvpn", "api", "smb", "pop3", "imap"
+))
+VULNERABILITY_CODES = CodeTable((
+    "outdated_ssl", "weak_password", "sql_injection", "buffer_overflow", "default_config",
+    "unpatched_service", "directory_traversal", "cross_site_scripting", "csrf_vulnerability",
+    "information_disclosure", "privilege_escalation", "weak_admin_password", "unpatched_rce",
+    "exposed_api_keys", "misconfigured_firewall"
+))
+OS_CODES = CodeTable(("Linux", "Windows", "FreeBSD", "Windows Server", "Embedded Linux", "Embedded"))
+NODE_TYPE_CODES = CodeTable((
+    "server", "personal", "dns", "webserver", "corporate", "government", "vpn_server", "router",
+    "iot", "educational", "hidden", "darknet", "underground", "commerce"
+))
+
+# Общее значение для узлов без геоданных (не изменять на месте - присваивать новый словарь)
+UNKNOWN_LOCATION = {"country": "Unknown", "city": "Unknown"}
 
 
 class NetworkNode:
-    """Класс сетевого узла"""
+    """Класс сетевого узла.
+
+    Узел хранится в __slots__: строки из малых наборов - кодами CodeTable,
+    пустые коллекции - общим пустым кортежем. Списки заменяются
+    присваиванием (или add_connection), а не изменением на месте.
+    """
+
+    __slots__ = (
+        "address", "name", "_type", "security_level", "_services", "_vulnerabilities",
+        "connected_nodes", "is_compromised", "owner", "heat_level",
+        "firewall", "ids_system", "honeypots", "subnet", "geo_location", "uptime",
+        "bandwidth", "_os_type", "last_scan", "network_interfaces", "open_ports",
+        "filtered_ports", "closed_ports", "response_time", "_save_fragment"
+    )
+
+    def __setattr__(self, name: str, value) -> None:
+        # Любое присваивание делает закэшированный JSON узла устаревшим
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_save_fragment", None)
 
     def __init__(self, address: str, name: str, node_type: str = "server"):
         self.address = address
         self.name = name
         self.type = node_type
         self.security_level = 1
-        self.services = []
-        self.vulnerabilities = []
-        self.connected_nodes = []
+        self.services = ()
+        self.vulnerabilities = ()
+        self.connected_nodes = ()
         self.is_compromised = False
         self.owner = "system"
         self.heat_level = 0
@@ -31,19 +122,59 @@ class NetworkNode:
         # НОВЫЕ свойства для расширенной сети
         self.firewall = None
         self.ids_system = None
-        self.honeypots = []
+        self.honeypots = ()
         self.subnet = None
-        self.geo_location = {"country": "Unknown", "city": "Unknown"}
+        self.geo_location = UNKNOWN_LOCATION
         self.uptime = 100
         self.bandwidth = "1Gbps"
         self.os_type = "Linux"
         self.last_scan = None
-        self.network_interfaces = []
-        self.open_ports = []
-        self.filtered_ports = []
-        self.closed_ports = []
+        self.network_interfaces = ()
+        self.open_ports = ()
+        self.filtered_ports = ()
+        self.closed_ports = ()
         self.response_time = 0
 
+    @property
+    def type(self) -> str:
+        return NODE_TYPE_CODES.names[self._type]
+
+    @type.setter
+    def type(self, value: str) -> None:
+        object.__setattr__(self, "_type", NODE_TYPE_CODES.code(value))
+
+    @property
+    def os_type(self) -> str:
+        return OS_CODES.names[self._os_type]
+
+    @os_type.setter
+    def os_type(self, value: str) -> None:
+        object.__setattr__(self, "_os_type", OS_CODES.code(value))
+
+    @property
+    def services(self) -> Tuple[str, ...]:
+        return SERVICE_CODES.decode(self._services)
+
+    @services.setter
+    def services(self, value) -> None:
+        object.__setattr__(self, "_services", SERVICE_CODES.encode(value))
+
+    @property
+    def vulnerabilities(self) -> Tuple[str, ...]:
+        return VULNERABILITY_CODES.decode(self._vulnerabilities)
+
+    @vulnerabilities.setter
+    def vulnerabilities(self, value) -> None:
+        object.__setattr__(self, "_vulnerabilities", VULNERABILITY_CODES.encode(value))
+
+    def add_connection(self, address: str) -> None:
+        """Добавляет связь с узлом (повторы отсекает NetworkSystem.link_nodes)"""
+        if self.connected_nodes:
+            self.connected_nodes.append(address)
+            self.mark_dirty()
+        else:
+            self.connected_nodes = [address]
+
     def to_dict(self) -> dict:
         """Преобразует узел в словарь для сохранения"""
         return {
@@ -52,9 +183,9 @@ class NetworkNode:
             "name": self.name,
             "type": self.type,
             "security_level": self.security_level,
-            "services": self.services,
-            "vulnerabilities": self.vulnerabilities,
-            "connected_nodes": self.connected_nodes,
+            "services": list(self.services),
+            "vulnerabilities": list(self.vulnerabilities),
+            "connected_nodes": list(self.connected_nodes),
             "is_compromised": self.is_compromised,
             "owner": self.owner,
             "heat_level": self.heat_level,
@@ -68,21 +199,33 @@ class NetworkNode:
             "uptime": self.uptime,
             "bandwidth": self.bandwidth,
             "os_type": self.os_type,
-            "network_interfaces": self.network_interfaces,
-            "open_ports": self.open_ports,
-            "filtered_ports": self.filtered_ports,
-            "closed_ports": self.closed_ports,
+            "network_interfaces": list(self.network_interfaces),
+            "open_ports": list(self.open_ports),
+            "filtered_ports": list(self.filtered_ports),
+            "closed_ports": list(self.closed_ports),
             "response_time": self.response_time
         }
 
+    def mark_dirty(self) -> None:
+        """Отметить изменение вложенных данных (списков, файрвола, ловушек)"""
+        object.__setattr__(self, "_save_fragment", None)
+
+    def save_fragment(self) -> CachedJSON:
+        """JSON узла для сохранения; кодируется заново только после изменений"""
+        fragment = self._save_fragment
+        if fragment is None:
+            fragment = CachedJSON.encode(self.to_dict())
+            object.__setattr__(self, "_save_fragment", fragment)
+        return fragment
+
     @classmethod
     def from_dict(cls, data: dict) -> 'NetworkNode':
         """Создает узел из словаря"""
         node = cls(data["address"], data["name"], data.get("type", "server"))
         node.security_level = data.get("security_level", 1)
-        node.services = data.get("services", [])
-        node.vulnerabilities = data.get("vulnerabilities", [])
-        node.connected_nodes = data.get("connected_nodes", [])
+        node.services = data.get("services") or ()
+        node.vulnerabilities = data.get("vulnerabilities") or ()
+        node.connected_nodes = data.get("connected_nodes") or ()
         node.is_compromised = data.get("is_compromised", False)
         node.owner = data.get("owner", "system")
         node.heat_level = data.get("heat_level", 0)
@@ -96,19 +239,20 @@ class NetworkNode:
         if ids_data:
             node.ids_system = IDSSystem.from_dict(ids_data)
 
-        honeypots_data = data.get("honeypots", [])
-        node.honeypots = [Honeypot.from_dict(hp_data) for hp_data in honeypots_data]
+        honeypots_data = data.get("honeypots")
+        if honeypots_data:
+            node.honeypots = [Honeypot.from_dict(hp_data) for hp_data in honeypots_data]
 
         # Остальные поля
         node.subnet = data.get("subnet")
-        node.geo_location = data.get("geo_location", {"country": "Unknown", "city": "Unknown"})
+        node.geo_location = data.get("geo_location") or UNKNOWN_LOCATION
         node.uptime = data.get("uptime", 100)
         node.bandwidth = data.get("bandwidth", "1Gbps")
         node.os_type = data.get("os_type", "Linux")
-        node.network_interfaces = data.get("network_interfaces", [])
-        node.open_ports = data.get("open_ports", [])
-        node.filtered_ports = data.get("filtered_ports", [])
-        node.closed_ports = data.get("closed_ports", [])
+        node.network_interfaces = data.get("network_interfaces") or ()
+        node.open_ports = data.get("open_ports") or ()
+        node.filtered_ports = data.get("filtered_ports") or ()
+        node.closed_ports = data.get("closed_ports") or ()
         node.response_time = data.get("response_time", 0)
 
         return node
@@ -261,20 +405,118 @@ class VPNConnection:
 
 
 class Botnet:
-    """Ботнет"""
+    """Ботнет.
+
+    Боты хранятся по колонкам в array: IP как uint32, коды страны и ОС,
+    пропускная способность. Колонки генерируются из зерна только при первом
+    обращении к ботам, запись бота (словарь) создается только для вывода.
+    """
+
+    COUNTRIES = ("US", "RU", "CN", "DE", "BR")
+    OS_TYPES = ("Windows", "Linux", "Android")
+
+    # Таблицы перевода случайных байтов в значения колонок (bytes.translate)
+    _OCTET_TABLE = bytes(1 + b % 255 for b in range(256))
+    _BANDWIDTH_TABLE = bytes(5 + b % 96 for b in range(256))
+    _COUNTRY_TABLE = bytes(b % 5 for b in range(256))
+    _OS_TABLE = bytes(b % 3 for b in range(256))
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, bot_count: int = 0, seed: Optional[int] = None):
         self.name = name
-        self.bots = []
         self.controller_ip = None
         self.command_servers = []
-        self.total_bandwidth = 0
         self.is_active = False
 
+        self._seed = seed
+        self._count = bot_count
+        self._ips: Optional[array] = None
+        self._countries: Optional[array] = None
+        self._os: Optional[array] = None
+
+        # Пропускная способность нужна сразу (рынок, атаки) - считаем при создании
+        self._bandwidth = array("B", self._random_bytes("bandwidth", bot_count).translate(self._BANDWIDTH_TABLE))
+        self.total_bandwidth = sum(self._bandwidth)
+
+    def _random_bytes(self, column: str, count: int) -> bytes:
+        if not count:
+            return b""
+        return _random.Random(f"{self._seed}:{self.name}:{column}").randbytes(count)
+
+    def _generate(self) -> None:
+        """Генерирует колонки IP, стран и ОС при первом обращении"""
+        if self._ips is not None:
+            return
+        count = self._count
+        self._ips = array("I")
+        self._ips.frombytes(self._random_bytes("ip", count * 4).translate(self._OCTET_TABLE))
+        self._countries = array("B", self._random_bytes("country", count).translate(self._COUNTRY_TABLE))
+        self._os = array("B", self._random_bytes("os", count).translate(self._OS_TABLE))
+
+    def __len__(self) -> int:
+        return len(self._bandwidth)
+
+    @property
+    def bots(self) -> "_BotView":
+        """Боты как последовательность словарей {"ip", "info"}"""
+        return _BotView(self)
+
+    def bot(self, index: int) -> dict:
+        """Запись бота для вывода"""
+        self._generate()
+        ip = self._ips[index]
+        return {
+            "ip": f"{ip >> 24}.{(ip >> 16) & 0xFF}.{(ip >> 8) & 0xFF}.{ip & 0xFF}",
+            "info": {
+                "country": self.COUNTRIES[self._countries[index]],
+                "bandwidth": self._bandwidth[index],
+                "os": self.OS_TYPES[self._os[index]]
+            }
+        }
+
     def add_bot(self, bot_ip: str, bot_info: dict):
         """Добавить бот в сеть"""
-        self.bots.append({"ip": bot_ip, "info": bot_info})
-        self.total_bandwidth += bot_info.get("bandwidth", 10)
+        self._generate()
+        a, b, c, d = (int(octet) for octet in bot_ip.split("."))
+        bandwidth = min(255, bot_info.get("bandwidth", 10))
+        self._ips.append((a << 24) | (b << 16) | (c << 8) | d)
+        self._countries.append(self.COUNTRIES.index(bot_info["country"]) if bot_info.get("country") in self.COUNTRIES else 0)
+        self._os.append(self.OS_TYPES.index(bot_info["os"]) if bot_info.get("os") in self.OS_TYPES else 0)
+        self._bandwidth.append(bandwidth)
+        self._count += 1
+        self.total_bandwidth += bandwidth
+
+    def remove_bots(self, count: int) -> None:
+        """Убирает первых count ботов"""
+        self._generate()
+        self.total_bandwidth -= sum(self._bandwidth[:count])
+        for column in (self._ips, self._countries, self._os, self._bandwidth):
+            del column[:count]
+        self._count = len(self._bandwidth)
+
+
+class _BotView:
+    """Ленивое представление ботов ботнета как последовательности"""
+
+    __slots__ = ("_botnet",)
+
+    def __init__(self, botnet: Botnet):
+        self._botnet = botnet
+
+    def __len__(self) -> int:
+        return len(self._botnet)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._botnet.bot(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс бота вне диапазона")
+        return self._botnet.bot(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._botnet.bot(i)
 
 
 class NetworkTools:
@@ -334,7 +576,7 @@ class NetworkTools:
 
         # Обнаружение уязвимостей
         if scan_type in ["full", "vuln"]:
-            result["vulnerabilities"] = node.vulnerabilities.copy()
+            result["vulnerabilities"] = list(node.vulnerabilities)
 
         # Проверка обнаружения
         if self._check_detection(node, scan_type):
@@ -685,19 +927,12 @@ class BotnetManager:
         botnets = []
 
         for name in names:
-            botnet = Botnet(f"{name}-{random.randint(1000, 9999)}")
-            bot_count = random.randint(100, 10000)
-
-            for i in range(bot_count):
-                bot_ip = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
-                bot_info = {
-                    "country": random.choice(["US", "RU", "CN", "DE", "BR"]),
-                    "bandwidth": random.randint(5, 100),
-                    "os": random.choice(["Windows", "Linux", "Android"])
-                }
-                botnet.add_bot(bot_ip, bot_info)
-
-            botnets.append(botnet)
+            # Боты генерируются из зерна по колонкам (см. Botnet)
+            botnets.append(Botnet(
+                f"{name}-{random.randint(1000, 9999)}",
+                bot_count=random.randint(100, 10000),
+                seed=random.getrandbits(32)
+            ))
 
         return botnets
 
@@ -710,6 +945,9 @@ class BotnetManager:
             for i, botnet in enumerate(self.owned_botnets, 1):
                 print(f"   {i}. {botnet.name} - {len(botnet.bots)} ботов, "
                       f"{botnet.total_bandwidth} Mbps")
+                for bot in botnet.bots[:3]:
+                    info = bot["info"]
+                    print(f"      {bot['ip']:<15} {info['country']} {info['os']:<8} {info['bandwidth']} Mbps")
 
         print(f"\n{XSSColors.INFO}💰 Доступные для покупки:{XSSColors.RESET}")
         for i, botnet in enumerate(self.available_botnets, 1):
@@ -831,20 +1069,174 @@ class BotnetManager:
         # Небольшой шанс потерять ботов
         bots_lost = random.randint(0, len(botnet.bots) // 20)
         if bots_lost > 0:
-            botnet.bots = botnet.bots[bots_lost:]
-            botnet.total_bandwidth -= bots_lost * 10
+            botnet.remove_bots(bots_lost)
             print(f"{XSSColors.WARNING}Потеряно {bots_lost} ботов в ходе атаки{XSSColors.RESET}")
 
         return result
 
 
+_MISSING = object()
+
+
+class LazyNodeMap(dict):
+    """Узлы сети с ленивым созданием NetworkNode.
+
+    Загруженные узлы хранятся сырыми записями сохранения (dict) и
+    превращаются в NetworkNode при первом обращении по адресу, поэтому
+    загрузка не зависит от размера сети. values()/items() создают все узлы.
+
+    Узлы процедурного мира (world) доступны по адресу; в словарь узел
+    мира попадает только при создании NetworkNode или изменении записи.
+    len() и итерация учитывают лишь такие узлы (размер мира - len(world)).
+    Узел мира, не отличающийся от сгенерированного, не сохраняется -
+    он будет сгенерирован заново.
+    """
+
+    def __init__(self, records: Optional[Dict[str, Any]] = None, world: Optional[ProceduralWorld] = None):
+        super().__init__(records or {})
+        # JSON сырых записей для сохранения без создания узлов
+        self._fragments: Dict[str, CachedJSON] = {}
+        # to_dict() узлов мира в момент создания - для пропуска нетронутых при сохранении
+        self._pristine: Dict[str, dict] = {}
+        self.set_world(world)
+
+    def set_world(self, world: Optional[ProceduralWorld]) -> None:
+        """Подключает процедурный мир, узлы которого появляются по запросу"""
+        self.world = world
+
+    def _lookup(self, address: str) -> Any:
+        """Значение из словаря или запись мира (в словарь не кладется)"""
+        value = dict.get(self, address, _MISSING)
+        if value is _MISSING and self.world is not None:
+            record = self.world.record(address)
+            if record is not None:
+                value = record
+        return value
+
+    def _hydrate(self, address: str, value: Any) -> 'NetworkNode':
+        if type(value) is dict:
+            from_world = not dict.__contains__(self, address)
+            value = NetworkNode.from_dict(value)
+            dict.__setitem__(self, address, value)
+            self._fragments.pop(address, None)
+            if from_world:
+                self._pristine[address] = value.to_dict()
+        return value
+
+    def __getitem__(self, address: str) -> 'NetworkNode':
+        value = self._lookup(address)
+        if value is _MISSING:
+            raise KeyError(address)
+        return self._hydrate(address, value)
+
+    def __setitem__(self, address: str, node: 'NetworkNode') -> None:
+        dict.__setitem__(self, address, node)
+        self._fragments.pop(address, None)
+        self._pristine.pop(address, None)
+
+    def __delitem__(self, address: str) -> None:
+        dict.__delitem__(self, address)
+        self._fragments.pop(address, None)
+        self._pristine.pop(address, None)
+
+    def __contains__(self, address: Any) -> bool:
+        return dict.__contains__(self, address) or (self.world is not None and address in self.world)
+
+    def get(self, address: str, default: Any = None) -> Any:
+        value = self._lookup(address)
+        if value is _MISSING:
+            return default
+        return self._hydrate(address, value)
+
+    def pop(self, address: str, default: Any = _MISSING) -> Any:
+        if address not in self:
+            if default is _MISSING:
+                raise KeyError(address)
+            return default
+        node = self[address]
+        del self[address]
+        return node
+
+    def values(self) -> List['NetworkNode']:
+        return [self[address] for address in self]
+
+    def items(self) -> List[Tuple[str, 'NetworkNode']]:
+        return [(address, self[address]) for address in self]
+
+    def is_hydrated(self, address: str) -> bool:
+        """Создан ли уже объект узла"""
+        return type(dict.__getitem__(self, address)) is not dict
+
+    def peek(self, address: str, field: str, default: Any = None) -> Any:
+        """Читает поле узла, не создавая NetworkNode"""
+        value = dict.get(self, address, _MISSING)
+        if value is _MISSING:
+            value = self.world.record(address) if self.world is not None else None
+            if value is None:
+                raise KeyError(address)
+        if type(value) is dict:
+            return value.get(field, default)
+        return getattr(value, field, default)
+
+    def neighbors(self, address: str) -> List[str]:
+        """Связи узла, не создавая NetworkNode (пусто для неизвестного адреса)"""
+        value = dict.get(self, address, _MISSING)
+        if value is _MISSING:
+            return self.world.neighbor_addresses(address) if self.world is not None else []
+        if type(value) is dict:
+            return value.get("connected_nodes", [])
+        return value.connected_nodes
+
+    def adjacency(self) -> List[Tuple[str, List[str]]]:
+        """Связи всех появившихся узлов для индекса графа"""
+        return [(address, self.neighbors(address)) for address in dict.keys(self)]
+
+    def set_field(self, address: str, field: str, value: Any) -> None:
+        """Меняет простое поле узла, не создавая NetworkNode"""
+        node = self._lookup(address)
+        if node is _MISSING:
+            raise KeyError(address)
+        if type(node) is dict:
+            if not dict.__contains__(self, address):
+                # Измененная запись мира сохраняется как есть
+                node = dict(node)
+                dict.__setitem__(self, address, node)
+            node[field] = value
+            self._fragments.pop(address, None)
+        else:
+            setattr(node, field, value)
+
+    def save_items(self, cached: bool = False) -> Dict[str, Any]:
+        """Данные узлов для сохранения; сырые записи сохраняются как есть"""
+        result = {}
+        pristine = self._pristine
+        for address, value in dict.items(self):
+            if address in pristine and value.to_dict() == pristine[address]:
+                continue
+            if type(value) is dict:
+                if cached:
+                    fragment = self._fragments.get(address)
+                    if fragment is None:
+                        fragment = self._fragments[address] = CachedJSON.encode(value)
+                    value = fragment
+            elif cached:
+                value = value.save_fragment()
+            else:
+                value = value.to_dict()
+            result[address] = value
+        return result
+
+
 class NetworkSystem:
     """Система управления сетью"""
 
     def __init__(self):
-        self.nodes = {}
+        self.nodes = LazyNodeMap()
         self.discovered_nodes = set()
         self.current_path = []
+        self.world: Optional[ProceduralWorld] = None
+        # Индекс связей (см. link_nodes) - для проверок связи и обратных запросов
+        self.graph = NetworkGraph()
 
         # НОВЫЕ компоненты
         self.network_tools = NetworkTools(self)
@@ -854,6 +1246,34 @@ class NetworkSystem:
         self._initialize_base_network()
         self._initialize_advanced_network()  # НОВЫЙ метод
 
+        world_size = GAME_SETTINGS.get('network_world_size', 0)
+        if world_size:
+            self.attach_world(ProceduralWorld(world_size, random.getrandbits(32)))
+
+    def attach_world(self, world: ProceduralWorld, link: bool = True) -> None:
+        """Подключает процедурный мир; link - связать DNS-серверы с его шлюзами"""
+        self.world = world
+        self.nodes.set_world(world)
+        self.graph.world = world
+        if not link:
+            return
+        entry_points = world.hubs(WORLD_ENTRY_POINTS)
+        for address in ("8.8.8.8", "1.1.1.1"):
+            if address in self.nodes:
+                for hub in entry_points:
+                    self.link_nodes(address, hub)
+
+    def link_nodes(self, source: str, target: str) -> bool:
+        """Добавляет связь source -> target в узел и в индекс графа; False, если она уже есть"""
+        if source not in self.nodes or not self.graph.add_edge(source, target):
+            return False
+        self.nodes[source].add_connection(target)
+        return True
+
+    def who_can_reach(self, address: str, max_depth: Optional[int] = None) -> List[str]:
+        """Узлы, с которых можно добраться до address (не дальше max_depth переходов)"""
+        return sorted(self.graph.can_reach(address, max_depth))
+
     def _initialize_base_network(self) -> None:
         """Инициализирует базовую сеть"""
         # Localhost - стартовый узел
@@ -927,8 +1347,8 @@ class NetworkSystem:
                 # Добавляем honeypots к высокозащищенным узлам
                 if node.security_level >= 7:
                     honeypot_types = ["ssh", "web", "ftp"]
-                    for hp_type in random.sample(honeypot_types, random.randint(1, 2)):
-                        node.honeypots.append(Honeypot(hp_type))
+                    node.honeypots = [Honeypot(hp_type)
+                                      for hp_type in random.sample(honeypot_types, random.randint(1, 2))]
 
         # Создаем более реалистичные подсети
         self._create_subnets()
@@ -1004,6 +1424,8 @@ class NetworkSystem:
         # Университетский сервер связан с образовательными ресурсами
         self.nodes["server.university.edu"].connected_nodes = ["news.hackerz.net", "cloud.storage.net"]
 
+        self.graph.rebuild(self.nodes.adjacency())
+
     def get_current_node(self) -> Optional[NetworkNode]:
         """Получает текущий узел"""
         current_address = game_state.get_stat("current_node", "localhost")
@@ -1059,6 +1481,8 @@ class NetworkSystem:
 
         undiscovered = len(self.nodes) - discovered_count
         print(f"\n{XSSColors.INFO}Обнаружено узлов: {discovered_count}/{len(self.nodes)}{XSSColors.RESET}")
+        if self.world is not None:
+            print(f"{XSSColors.INFO}Размер мира: {len(self.world)} узлов{XSSColors.RESET}")
 
         if current_node and current_node.connected_nodes:
             print(f"\n{XSSColors.INFO}🔗 Доступные соединения:{XSSColors.RESET}")
@@ -1095,7 +1519,8 @@ class NetworkSystem:
             return False
 
         # Проверяем, можем ли подключиться
-        if target_address not in current_node.connected_nodes:
+        current_address = game_state.get_stat("current_node", "localhost")
+        if not self.graph.has_edge(current_address, target_address):
             print(f"{XSSColors.ERROR}Нет прямого соединения с {target_address}{XSSColors.RESET}")
             print(f"{XSSColors.INFO}Используйте 'scan' для поиска доступных узлов{XSSColors.RESET}")
             return False
@@ -1323,9 +1748,7 @@ class NetworkSystem:
             self.nodes[address] = node
 
             # Добавляем связь с текущим узлом
-            current_node = self.get_current_node()
-            if current_node and address not in current_node.connected_nodes:
-                current_node.connected_nodes.append(address)
+            self.link_nodes(game_state.get_stat("current_node", "localhost"), address)
 
             self.discovered_nodes.add(address)
 
@@ -1365,32 +1788,30 @@ class NetworkSystem:
                 print(f"   {i + 1}. {hop} (unknown) - timeout")
 
     def _calculate_route(self, target: str) -> List[str]:
-        """Вычисляет маршрут до цели (упрощенный BFS)"""
+        """Вычисляет маршрут до цели (BFS без создания узлов по пути)"""
         current = game_state.get_stat("current_node", "localhost")
 
         if current == target:
             return [target]
 
-        # Простой поиск пути
-        visited = set()
-        queue = [(current, [current])]
+        parents = {current: None}
+        queue = deque([current])
 
         while queue:
-            node_addr, path = queue.pop(0)
+            node_addr = queue.popleft()
 
             if node_addr == target:
+                path = []
+                while node_addr is not None:
+                    path.append(node_addr)
+                    node_addr = parents[node_addr]
+                path.reverse()
                 return path
 
-            if node_addr in visited:
-                continue
-
-            visited.add(node_addr)
-
-            if node_addr in self.nodes:
-                node = self.nodes[node_addr]
-                for connected in node.connected_nodes:
-                    if connected not in visited:
-                        queue.append((connected, path + [connected]))
+            for connected in self.nodes.neighbors(node_addr):
+                if connected not in parents:
+                    parents[connected] = node_addr
+                    queue.append(connected)
 
         return []
 
@@ -1435,10 +1856,11 @@ class NetworkSystem:
         if random.random() < 0.1:  # 10% шанс
             self._network_event()
 
-        # Обновляем heat level узлов
-        for node in self.nodes.values():
-            if node.heat_level > 0:
-                node.heat_level = max(0, node.heat_level - 1)
+        # Обновляем heat level узлов (без создания еще не загруженных узлов)
+        for address in self.nodes:
+            heat_level = self.nodes.peek(address, "heat_level", 0)
+            if heat_level > 0:
+                self.nodes.set_field(address, "heat_level", max(0, heat_level - 1))
 
     def _network_event(self) -> None:
         """Генерирует случайное сетевое событие"""
@@ -1471,17 +1893,21 @@ class NetworkSystem:
             # Добавляем связь с случайным существующим узлом
             existing = random.choice(list(self.nodes.keys()))
             if existing != address:
-                self.nodes[existing].connected_nodes.append(address)
+                self.link_nodes(existing, address)
 
             print(f"\n{XSSColors.INFO}📡 Новый узел появился в сети: {name}{XSSColors.RESET}")
 
     def _node_security_update(self) -> None:
         """Обновление безопасности узла"""
         # Выбираем случайный не взломанный узел
-        candidates = [n for n in self.nodes.values() if not n.is_compromised and n.type != "personal"]
+        candidates = [
+            address for address in self.nodes
+            if not self.nodes.peek(address, "is_compromised", False)
+            and self.nodes.peek(address, "type", "server") != "personal"
+        ]
 
         if candidates:
-            node = random.choice(candidates)
+            node = self.nodes[random.choice(candidates)]
             old_level = node.security_level
             node.security_level = min(10, node.security_level + 1)
 
@@ -1492,10 +1918,13 @@ class NetworkSystem:
     def _network_maintenance(self) -> None:
         """Техническое обслуживание сети"""
         # Случайный узел временно недоступен
-        candidates = [n for n in self.nodes.values() if n.type != "personal" and n.address != "localhost"]
+        candidates = [
+            address for address in self.nodes
+            if address != "localhost" and self.nodes.peek(address, "type", "server") != "personal"
+        ]
 
         if candidates:
-            node = random.choice(candidates)
+            node = self.nodes[random.choice(candidates)]
             if node.address in self.discovered_nodes:
                 print(f"\n{XSSColors.INFO}🔧 {node.name} на техническом обслуживании{XSSColors.RESET}")
 
@@ -1514,30 +1943,41 @@ class NetworkSystem:
         """Возвращает статистику сети"""
         total_nodes = len(self.nodes)
         discovered = len(self.discovered_nodes)
-        compromised = sum(1 for n in self.nodes.values() if n.is_compromised)
+        compromised = sum(1 for address in self.nodes if self.nodes.peek(address, "is_compromised", False))
 
         return {
             "total_nodes": total_nodes,
+            "world_nodes": len(self.world) if self.world is not None else 0,
             "discovered": discovered,
             "compromised": compromised,
             "discovery_percent": (discovered / total_nodes * 100) if total_nodes > 0 else 0,
             "control_percent": (compromised / total_nodes * 100) if total_nodes > 0 else 0
         }
 
-    def save_network_state(self) -> Dict:
-        """Сохраняет состояние сети"""
-        return {
-            "nodes": {addr: node.to_dict() for addr, node in self.nodes.items()},
+    def save_network_state(self, cached: bool = False) -> Dict:
+        """Сохраняет состояние сети
+
+        cached - узлы возвращаются готовыми JSON-фрагментами, неизменившиеся
+        узлы повторно не кодируются.
+        """
+        state = {
+            "nodes": self.nodes.save_items(cached),
             "discovered_nodes": list(self.discovered_nodes),
             "current_path": self.current_path
         }
+        # Процедурный мир сохраняется параметрами, в nodes - только затронутые узлы
+        if self.world is not None:
+            state["world"] = self.world.to_dict()
+        return state
 
     def load_network_state(self, data: Dict) -> None:
         """Загружает состояние сети"""
         if "nodes" in data:
-            self.nodes = {}
-            for addr, node_data in data["nodes"].items():
-                self.nodes[addr] = NetworkNode.from_dict(node_data)
+            # Узлы создаются при первом обращении (см. LazyNodeMap)
+            self.world = ProceduralWorld.from_dict(data["world"]) if data.get("world") else None
+            self.nodes = LazyNodeMap(data["nodes"], self.world)
+            self.graph = NetworkGraph(self.world)
+            self.graph.rebuild(self.nodes.adjacency())
 
         if "discovered_nodes" in data:
             self.discovered_nodes = set(data["discovered_nodes"])
@@ -1545,5 +1985,15 @@ class NetworkSystem:
         if "current_path" in data:
             self.current_path = data["current_path"]
 
-# Глобальный экземпляр сетевой системы
-network_system = NetworkSystem()
\ No newline at end of file
+def _create_network_system() -> NetworkSystem:
+    """Строит сеть сессии при первом обращении и применяет отложенное сохранение"""
+    network = NetworkSystem()
+    state = resolve(game_state).take_network_state()
+    if state is not None:
+        network.load_network_state(state)
+    return network
+
+
+# Экземпляр сетевой системы текущей сессии (см. core/session.py).
+# Сеть строится при первой сетевой команде, а не при импорте модуля
+network_system = session_system("network_system", _create_network_system)
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Индекс связей сети: множества смежности, обратные ребра и степени узлов
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class NetworkGraph:
+    """Прямые и обратные множества смежности узлов сети.
+
+    Проверка связи, списки соседей и степени - O(1). Связи узлов
+    процедурного мира, топология которых не менялась, в индекс не
+    копируются: они берутся из массивов мира (там связи симметричны).
+    Узел попадает в индекс при первом изменении его связей.
+    """
+
+    def __init__(self, world: Optional[Any] = None):
+        self.world = world
+        self._out: Dict[str, Set[str]] = {}
+        self._in: Dict[str, Set[str]] = {}
+        self.edge_count = 0
+
+    def rebuild(self, adjacency: Iterable) -> None:
+        """Строит индекс заново из пар (адрес, связи)"""
+        self._out.clear()
+        self._in.clear()
+        self.edge_count = 0
+        for address, targets in adjacency:
+            self._index(address, targets)
+
+    def _index(self, address: str, targets: Iterable[str]) -> Set[str]:
+        out = self._out.get(address)
+        if out is None:
+            out = self._out[address] = set()
+        for target in targets:
+            if target not in out:
+                out.add(target)
+                self._in.setdefault(target, set()).add(address)
+                self.edge_count += 1
+        return out
+
+    def _world_neighbors(self, address: str) -> List[str]:
+        if self.world is None:
+            return []
+        return self.world.neighbor_addresses(address)
+
+    def add_edge(self, source: str, target: str) -> bool:
+        """Добавляет связь source -> target; False, если она уже есть"""
+        out = self._out.get(source)
+        if out is None:
+            # Первое изменение узла мира - переносим его связи в индекс
+            out = self._index(source, self._world_neighbors(source))
+        if target in out:
+            return False
+        out.add(target)
+        self._in.setdefault(target, set()).add(source)
+        self.edge_count += 1
+        return True
+
+    def remove_edge(self, source: str, target: str) -> bool:
+        """Удаляет связь source -> target; False, если ее не было"""
+        out = self._out.get(source)
+        if out is None:
+            out = self._index(source, self._world_neighbors(source))
+        if target not in out:
+            return False
+        out.discard(target)
+        self._in[target].discard(source)
+        self.edge_count -= 1
+        return True
+
+    def set_edges(self, source: str, targets: Iterable[str]) -> None:
+        """Заменяет все исходящие связи узла"""
+        for target in list(self.successors(source)):
+            self.remove_edge(source, target)
+        self._index(source, targets)
+
+    def has_edge(self, source: str, target: str) -> bool:
+        out = self._out.get(source)
+        if out is not None:
+            return target in out
+        return target in self._world_neighbors(source)
+
+    def successors(self, address: str) -> Set[str]:
+        """Узлы, в которые ведут связи из address"""
+        out = self._out.get(address)
+        if out is not None:
+            return out
+        return set(self._world_neighbors(address))
+
+    def predecessors(self, address: str) -> Set[str]:
+        """Узлы, из которых есть связь в address"""
+        sources = set(self._in.get(address, ()))
+        # Неизмененные соседи в мире ссылаются на address через массивы мира
+        for neighbor in self._world_neighbors(address):
+            if neighbor not in self._out:
+                sources.add(neighbor)
+        return sources
+
+    def out_degree(self, address: str) -> int:
+        out = self._out.get(address)
+        return len(out) if out is not None else len(self._world_neighbors(address))
+
+    def in_degree(self, address: str) -> int:
+        if self.world is None or address not in self.world:
+            return len(self._in.get(address, ()))
+        return len(self.predecessors(address))
+
+    def can_reach(self, target: str, max_depth: Optional[int] = None) -> Set[str]:
+        """Узлы, из которых есть путь до target (обход по обратным ребрам)"""
+        depths = {target: 0}
+        queue = deque([target])
+        while queue:
+            address = queue.popleft()
+            depth = depths[address]
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for source in self.predecessors(address):
+                if source not in depths:
+                    depths[source] = depth + 1
+                    queue.append(source)
+        del depths[target]
+        return set(depths)
@@ -0,0 +1,325 @@
+"""
+Процедурный генератор большой сети: подсети, уровни защиты, безмасштабные связи
+"""
+
+import random as _random
+import time
+from array import array
+from collections import deque
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional
+
+# Профили типов узлов: (тип, имя, вес, (мин, макс) защиты, сервисы, ОС)
+NODE_PROFILES = (
+    ("personal", "Home PC", 30, (0, 2), ("http", "smb"), ("Windows", "Linux")),
+    ("iot", "IoT Device", 20, (1, 2), ("http", "telnet"), ("Embedded",)),
+    ("router", "Edge Router", 10, (1, 3), ("telnet", "http", "ssh"), ("Embedded Linux",)),
+    ("webserver", "Web Server", 18, (2, 5), ("http", "https", "ssh"), ("Linux", "FreeBSD")),
+    ("dns", "DNS Resolver", 3, (3, 5), ("dns_service",), ("Linux",)),
+    ("educational", "Campus Server", 6, (2, 4), ("http", "ssh", "ftp"), ("Linux",)),
+    ("corporate", "Corporate Server", 9, (4, 7), ("http", "https", "ftp", "smtp"), ("Windows Server", "Linux")),
+    ("government", "Government Server", 2, (7, 10), ("https", "ssh"), ("Windows Server",)),
+    ("darknet", "Hidden Service", 2, (5, 8), ("tor", "https"), ("Linux", "FreeBSD")),
+)
+
+VULNERABILITIES = (
+    "outdated_ssl", "weak_password", "sql_injection",
+    "buffer_overflow", "default_config", "unpatched_service",
+    "directory_traversal", "cross_site_scripting", "csrf_vulnerability",
+    "information_disclosure", "privilege_escalation"
+)
+
+GEO_LOCATIONS = (
+    {"country": "US", "city": "New York"},
+    {"country": "UK", "city": "London"},
+    {"country": "DE", "city": "Berlin"},
+    {"country": "RU", "city": "Moscow"},
+    {"country": "CN", "city": "Beijing"},
+    {"country": "JP", "city": "Tokyo"}
+)
+
+# Адреса мира - блок 100.64.0.0/10, подсети /24 по 254 узла (.1 - шлюз)
+HOSTS_PER_SUBNET = 254
+FIRST_OCTET = 100
+SECOND_OCTET_BASE = 64
+MAX_NODES = 64 * 256 * HOSTS_PER_SUBNET
+
+# Связи шлюза с ранее созданными шлюзами (магистраль Барабаши-Альберт)
+BACKBONE_LINKS = 2
+# Доля узлов с дополнительной связью за пределы своей подсети
+CROSS_LINK_CHANCE = 0.2
+
+
+def _profile_tables():
+    """Таблицы translate: случайный байт -> тип и уровень защиты.
+
+    Типы получают доли из 256 значений байта пропорционально весам, уровни
+    защиты распределены по долям своего типа. Обе колонки строятся из
+    одних и тех же байтов через bytes.translate без цикла Python.
+    """
+    total = sum(profile[2] for profile in NODE_PROFILES)
+    slots = []
+    for type_code, (_, _, weight, (low, high), _, _) in enumerate(NODE_PROFILES):
+        levels = high - low + 1
+        count = max(1, round(256 * weight / total))
+        slots.extend((type_code, low + i % levels) for i in range(count))
+    # Округление весов - дополняем или обрезаем до 256 значений байта
+    slots = (slots * 2)[:256]
+
+    type_of = bytes(type_code for type_code, _ in slots)
+    security_of = bytes(security for _, security in slots)
+    return type_of, security_of
+
+
+_TYPE_TABLE, _SECURITY_TABLE = _profile_tables()
+
+
+class ProceduralWorld:
+    """Процедурная сеть, полностью задаваемая (size, seed).
+
+    Колонки типов, уровней защиты и связи хранятся в массивах, поэтому
+    мир не сохраняется - по зерну он строится заново. Записи узлов
+    (формат NetworkNode.to_dict) создаются только по запросу.
+    """
+
+    def __init__(self, size: int, seed: int):
+        if not 0 < size <= MAX_NODES:
+            raise ValueError(f"размер мира должен быть от 1 до {MAX_NODES}")
+        self.size = size
+        self.seed = seed
+
+        rng = _random.Random(seed)
+        column = rng.randbytes(size)
+        self.types = array("B", column.translate(_TYPE_TABLE))
+        self.security = array("B", column.translate(_SECURITY_TABLE))
+
+        self.offsets, self.neighbors = self._generate_links(rng)
+
+    def _generate_links(self, rng: _random.Random):
+        """Связи: узлы подсети - к своему шлюзу, шлюзы - предпочтительным присоединением"""
+        size = self.size
+        src = array("I")
+        dst = array("I")
+        # Концы ребер: выбор случайного конца = выбор узла пропорционально степени
+        backbone = array("I")
+        endpoints = array("I")
+        randrange = rng.randrange
+        random = rng.random
+
+        for i in range(size):
+            host = i % HOSTS_PER_SUBNET
+            if host == 0:
+                if not backbone:
+                    # Первый шлюз - затравка магистрали
+                    backbone.append(i)
+                    continue
+                linked = set()
+                for _ in range(BACKBONE_LINKS):
+                    target = backbone[randrange(len(backbone))]
+                    if target in linked:
+                        continue
+                    linked.add(target)
+                    src.append(i)
+                    dst.append(target)
+                    backbone.append(target)
+                    backbone.append(i)
+                    endpoints.append(target)
+                    endpoints.append(i)
+                continue
+
+            gateway = i - host
+            src.append(i)
+            dst.append(gateway)
+            endpoints.append(gateway)
+            endpoints.append(i)
+            if random() < CROSS_LINK_CHANCE:
+                target = endpoints[randrange(len(endpoints))]
+                if target != i and target != gateway:
+                    src.append(i)
+                    dst.append(target)
+                    endpoints.append(target)
+                    endpoints.append(i)
+
+        # Списки смежности в формате CSR: соседи узла i - neighbors[offsets[i]:offsets[i + 1]]
+        degree = array("I", bytes(4 * size))
+        for u in src:
+            degree[u] += 1
+        for v in dst:
+            degree[v] += 1
+        offsets = array("I", accumulate(degree, initial=0))
+        neighbors = array("I", bytes(4 * offsets[-1]))
+        fill = array("I", offsets[:-1])
+        for u, v in zip(src, dst):
+            neighbors[fill[u]] = v
+            fill[u] += 1
+            neighbors[fill[v]] = u
+            fill[v] += 1
+        return offsets, neighbors
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, address: Any) -> bool:
+        return self.index_of(address) is not None
+
+    def address(self, index: int) -> str:
+        subnet, host = divmod(index, HOSTS_PER_SUBNET)
+        return f"{FIRST_OCTET}.{SECOND_OCTET_BASE + (subnet >> 8)}.{subnet & 255}.{host + 1}"
+
+    def index_of(self, address: Any) -> Optional[int]:
+        """Индекс узла по адресу или None, если адрес не из этого мира"""
+        if not isinstance(address, str):
+            return None
+        parts = address.split(".")
+        if len(parts) != 4 or not all(part.isdigit() for part in parts):
+            return None
+        first, second, third, fourth = map(int, parts)
+        if first != FIRST_OCTET or not SECOND_OCTET_BASE <= second < SECOND_OCTET_BASE + 64:
+            return None
+        if third > 255 or not 1 <= fourth <= HOSTS_PER_SUBNET:
+            return None
+        index = (((second - SECOND_OCTET_BASE) << 8) | third) * HOSTS_PER_SUBNET + fourth - 1
+        return index if index < self.size else None
+
+    def subnet(self, index: int) -> str:
+        subnet = index // HOSTS_PER_SUBNET
+        return f"{FIRST_OCTET}.{SECOND_OCTET_BASE + (subnet >> 8)}.{subnet & 255}.0/24"
+
+    def degree(self, index: int) -> int:
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def neighbor_indices(self, index: int) -> array:
+        return self.neighbors[self.offsets[index]:self.offsets[index + 1]]
+
+    def neighbor_addresses(self, address: str) -> List[str]:
+        index = self.index_of(address)
+        if index is None:
+            return []
+        return [self.address(i) for i in self.neighbor_indices(index)]
+
+    def hubs(self, count: int) -> List[str]:
+        """Адреса шлюзов с наибольшей степенью - точки входа в мир"""
+        gateways = range(0, self.size, HOSTS_PER_SUBNET)
+        top = sorted(gateways, key=self.degree, reverse=True)[:count]
+        return [self.address(i) for i in top]
+
+    def record(self, address: str) -> Optional[Dict[str, Any]]:
+        """Запись узла в формате сохранения NetworkNode; детали - из зерна узла"""
+        index = self.index_of(address)
+        if index is None:
+            return None
+
+        node_type, label, _, _, services, systems = NODE_PROFILES[self.types[index]]
+        security = self.security[index]
+        rng = _random.Random(self.seed * MAX_NODES + index)
+
+        record = {
+            "address": address,
+            "name": f"{label} {address}",
+            "type": node_type,
+            "security_level": security,
+            "services": rng.sample(services, rng.randint(1, len(services))),
+            "vulnerabilities": rng.sample(VULNERABILITIES, rng.randint(1, 3)) if security < 5 else [],
+            "connected_nodes": self.neighbor_addresses(address),
+            "subnet": self.subnet(index),
+            "geo_location": dict(GEO_LOCATIONS[(index // HOSTS_PER_SUBNET + self.seed) % len(GEO_LOCATIONS)]),
+            "os_type": rng.choice(systems),
+        }
+
+        # Защита - по тем же правилам, что и у базовой сети
+        if node_type in ("corporate", "government", "webserver"):
+            if security >= 3:
+                record["firewall"] = {"type": "basic" if security < 6 else "advanced"}
+            if security >= 5:
+                record["ids_system"] = {"type": "signature" if security < 8 else "hybrid"}
+            if security >= 7:
+                record["honeypots"] = [{"type": hp_type}
+                                       for hp_type in rng.sample(("ssh", "web", "ftp"), rng.randint(1, 2))]
+        return record
+
+    def route(self, source: int, target: int) -> List[int]:
+        """Кратчайший маршрут по индексам (BFS по массивам, без создания узлов)"""
+        if source == target:
+            return [source]
+        parent = array("i", [-1]) * self.size
+        parent[source] = source
+        offsets, neighbors = self.offsets, self.neighbors
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if parent[nxt] != -1:
+                    continue
+                parent[nxt] = current
+                if nxt == target:
+                    path = [target]
+                    while path[-1] != source:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path
+                queue.append(nxt)
+        return []
+
+    def to_dict(self) -> Dict[str, int]:
+        """Мир сохраняется только параметрами генерации"""
+        return {"size": self.size, "seed": self.seed}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, int]) -> "ProceduralWorld":
+        return cls(data["size"], data["seed"])
+
+
+def benchmark(sizes: Iterable[int], seed: int = 0, samples: int = 20) -> List[Dict[str, float]]:
+    """Замер генерации, карты, маршрутов и сканирования для каждого размера мира.
+
+    map - записи двухшаговой окрестности главного шлюза, route - средний
+    BFS между случайными узлами, scan - создание NetworkNode соседей узла.
+    Время в миллисекундах.
+    """
+    from systems.network import NetworkNode
+
+    results = []
+    for size in sizes:
+        started = time.perf_counter()
+        world = ProceduralWorld(size, seed)
+        generate_ms = (time.perf_counter() - started) * 1000
+
+        rng = _random.Random(seed)
+        picks = [rng.randrange(size) for _ in range(samples * 2)]
+
+        started = time.perf_counter()
+        hub = world.hubs(1)[0]
+        area = {hub}
+        for address in world.neighbor_addresses(hub):
+            area.add(address)
+            area.update(world.neighbor_addresses(address))
+        for address in area:
+            world.record(address)
+        map_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        hops = 0
+        for source, target in zip(picks[::2], picks[1::2]):
+            hops += len(world.route(source, target))
+        route_ms = (time.perf_counter() - started) * 1000 / samples
+
+        started = time.perf_counter()
+        scanned = 0
+        for index in picks[:samples]:
+            for address in world.neighbor_addresses(world.address(index)):
+                NetworkNode.from_dict(world.record(address))
+                scanned += 1
+        scan_ms = (time.perf_counter() - started) * 1000 / samples
+
+        results.append({
+            "nodes": size,
+            "links": len(world.neighbors) // 2,
+            "generate_ms": round(generate_ms, 1),
+            "map_ms": round(map_ms, 3),
+            "map_nodes": len(area),
+            "route_ms": round(route_ms, 3),
+            "route_hops": round(hops / samples, 1),
+            "scan_ms": round(scan_ms, 3),
+            "scan_nodes": round(scanned / samples, 1),
+        })
+    return results
@@ -0,0 +1,158 @@
+"""
+Потоковые агрегаты для статистики: обновление за O(1) без хранения выборки
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+
+class RunningStats:
+    """Счетчик, сумма, среднее и дисперсия по алгоритму Уэлфорда"""
+
+    __slots__ = ("count", "total", "mean", "_m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "total": self.total, "mean": self.mean,
+                "m2": self._m2, "min": self.minimum, "max": self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        stats = cls()
+        stats.count = data.get("count", 0)
+        stats.total = data.get("total", 0.0)
+        stats.mean = data.get("mean", 0.0)
+        stats._m2 = data.get("m2", 0.0)
+        stats.minimum = data.get("min")
+        stats.maximum = data.get("max")
+        return stats
+
+
+class P2Quantile:
+    """Оценка квантиля алгоритмом P² (Jain & Chlamtac): пять маркеров, O(1) память"""
+
+    __slots__ = ("p", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value: float) -> None:
+        heights = self._heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Ячейка, в которую попало значение; крайние маркеры сдвигаются
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Подстраиваем средние маркеры к желаемым позициям
+        for i in range(1, 4):
+            d = self._desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    @property
+    def value(self) -> Optional[float]:
+        heights = self._heights
+        if not heights:
+            return None
+        if len(heights) < 5:
+            # Пока маркеры не заполнены - точный квантиль по отсортированной выборке
+            return heights[min(len(heights) - 1, int(round(self.p * (len(heights) - 1))))]
+        return heights[2]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "heights": list(self._heights), "positions": list(self._positions),
+                "desired": list(self._desired)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "P2Quantile":
+        sketch = cls(data["p"])
+        sketch._heights = list(data.get("heights", []))
+        sketch._positions = list(data.get("positions", sketch._positions))
+        sketch._desired = list(data.get("desired", sketch._desired))
+        return sketch
+
+
+class OutcomeStats:
+    """Итоги по группе миссий: успехи, провалы и время выполнения"""
+
+    __slots__ = ("completed", "failed", "times")
+
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.times = RunningStats()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"completed": self.completed, "failed": self.failed, "times": self.times.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OutcomeStats":
+        outcome = cls()
+        outcome.completed = data.get("completed", 0)
+        outcome.failed = data.get("failed", 0)
+        outcome.times = RunningStats.from_dict(data.get("times", {}))
+        return outcome
@@ -0,0 +1,92 @@
+"""
+Планировщик таймеров на куче для дедлайнов миссий
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Collection, Dict, Hashable, List, Tuple
+
+
+def _session_clock() -> float:
+    """Настенное время; time.time берется при вызове, чтобы при записи и
+    воспроизведении сессии работали часы из core/replay.py"""
+    return time.time()
+
+
+class TimerScheduler:
+    """Куча пробуждений по часам сессии.
+
+    Пробуждения группируются по ключу: cancel(key) снимает все пробуждения
+    ключа лениво - устаревшие записи выбрасываются при извлечении из кучи.
+    poll() стоит O(1), пока ничего не наступило, и не зависит от числа таймеров.
+    """
+
+    def __init__(self, clock: Callable[[], float] = _session_clock):
+        self.clock = clock
+        self._heap: List[Tuple[float, int, Hashable, int, Callable, tuple]] = []
+        self._generations: Dict[Hashable, int] = {}
+        self._seq = itertools.count()
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[..., Any], *args) -> None:
+        """Вызвать callback(*args) через delay секунд"""
+        generation = self._generations.setdefault(key, 0)
+        heapq.heappush(self._heap, (self.clock() + max(0.0, delay), next(self._seq),
+                                    key, generation, callback, args))
+
+    def cancel(self, key: Hashable) -> None:
+        """Отменяет все пробуждения ключа"""
+        if key in self._generations:
+            self._generations[key] += 1
+
+    def poll(self) -> int:
+        """Вызывает наступившие пробуждения, возвращает их число"""
+        heap = self._heap
+        now = self.clock()
+        fired = 0
+        while heap and heap[0][0] <= now:
+            _, _, key, generation, callback, args = heapq.heappop(heap)
+            if self._generations.get(key) != generation:
+                continue
+            fired += 1
+            callback(*args)
+        return fired
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+# Доли лимита времени, после которых срабатывают предупреждения
+DEADLINE_THRESHOLDS = ((0.7, "low"), (0.9, "critical"), (1.0, "expired"))
+
+
+def schedule_deadline(scheduler: TimerScheduler, key: Hashable, start_time: float, time_limit: float,
+                      callback: Callable[[Hashable, str], Any], fired: Collection[str] = ()) -> None:
+    """Регистрирует пробуждения 30%/10%/истечение для таймера (start_time, time_limit в часах).
+
+    Таймер хранится в настенном времени (переживает сохранение),
+    пробуждения переводятся в часы планировщика. fired - уже
+    показанные уровни, они не планируются повторно. Из пройденных и еще
+    не показанных порогов срабатывает только самый поздний.
+    """
+    scheduler.cancel(key)
+    elapsed = time.time() - start_time
+    limit = time_limit * 3600
+
+    passed = None
+    for fraction, level in DEADLINE_THRESHOLDS:
+        if level in fired:
+            continue
+        delay = limit * fraction - elapsed
+        if delay <= 0:
+            passed = level
+        else:
+            scheduler.schedule(key, delay, callback, key, level)
+    if passed is not None:
+        scheduler.schedule(key, 0.0, callback, key, passed)
+
+
+def levels_up_to(level: str) -> List[str]:
+    """Уровень и все пороги до него (показ позднего порога закрывает ранние)"""
+    levels = [name for _, name in DEADLINE_THRESHOLDS]
+    return levels[:levels.index(level) + 1]
@@ -0,0 +1,230 @@
+"""
+Глобальные случайные события из каталога RANDOM_EVENTS
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import GAME_SETTINGS
+from ui.colors import XSSColors
+from core.game_state import game_state
+from core.session import session_system
+from core.replay import rng_stream
+from config.game_data import RANDOM_EVENTS
+from systems.crypto import crypto_system
+from systems.event_system import (
+    event_system, CryptoMarketChangeEvent, WorldEventStartedEvent, WorldEventEndedEvent
+)
+
+random = rng_stream("world_events")
+
+# Ключ статистики игрока: id события -> ход окончания
+ACTIVE_EVENTS_STAT = "active_world_events"
+
+# Базовая волатильность крипторынка (см. CryptoSystem)
+BASE_VOLATILITY = 0.05
+
+
+class AliasTable:
+    """Таблица выборки методом псевдонимов (Vose): построение O(n), выборка O(1)"""
+
+    __slots__ = ("outcomes", "_prob", "_alias")
+
+    def __init__(self, outcomes: Sequence[Any], weights: Sequence[float]):
+        n = len(outcomes)
+        if n == 0:
+            raise ValueError("пустой набор исходов")
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+
+        self.outcomes = list(outcomes)
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Остатки - погрешность округления, их вероятность 1
+
+    def sample(self, rng=random) -> Any:
+        i = rng.randrange(len(self.outcomes))
+        return self.outcomes[i] if rng.random() < self._prob[i] else self.outcomes[self._alias[i]]
+
+
+def compile_catalog(catalog: Dict[str, dict]) -> Optional[AliasTable]:
+    """Таблица выбора события, когда проверка случайных событий сработала.
+
+    probability в каталоге - относительный вес события; частоту событий
+    задает вызывающий код (см. XSSGame._process_random_events).
+    """
+    outcomes: List[str] = []
+    weights: List[float] = []
+    for event_id, data in catalog.items():
+        if data.get("probability", 0) > 0:
+            outcomes.append(event_id)
+            weights.append(data["probability"])
+    return AliasTable(outcomes, weights) if outcomes else None
+
+
+# Каталог компилируется один раз на процесс
+_CATALOG_TABLE = compile_catalog(RANDOM_EVENTS)
+
+
+class WorldEventEngine:
+    """Активные глобальные события с истечением по ходам.
+
+    Состояние хранится в статистике игрока (попадает в сохранение), куча
+    сроков окончания строится по нему заново только после загрузки.
+    """
+
+    def __init__(self, catalog: Dict[str, dict] = RANDOM_EVENTS):
+        self.catalog = catalog
+        self._table = _CATALOG_TABLE if catalog is RANDOM_EVENTS else compile_catalog(catalog)
+        self._active: Optional[Dict[str, int]] = None
+        self._expiry_heap: List[Tuple[int, str]] = []
+        # Эффекты рынка, примененные в этом процессе: id -> {"prices": {символ: множитель},
+        # "volatility": множитель}. Цены крипторынка не сохраняются, поэтому после
+        # загрузки снимать у начатых ранее событий нечего.
+        self.applied_effects: Dict[str, Dict[str, Any]] = {}
+
+    def _sync(self) -> Dict[str, int]:
+        """Состояние из статистики; куча перестраивается, если его заменила загрузка"""
+        active = game_state.get_stat(ACTIVE_EVENTS_STAT)
+        if active is None:
+            active = {}
+            game_state.set_stat(ACTIVE_EVENTS_STAT, active)
+        if active is not self._active:
+            self._active = active
+            self._expiry_heap = [(expires, event_id) for event_id, expires in active.items()]
+            heapq.heapify(self._expiry_heap)
+        return active
+
+    def _store(self, active: Dict[str, int]) -> None:
+        # Новый словарь через set_stat - изменение попадает в журнал сохранений
+        game_state.set_stat(ACTIVE_EVENTS_STAT, active)
+        self._active = active
+
+    def is_active(self, event_id: str) -> bool:
+        return event_id in self._sync()
+
+    def active_effects(self, name: str) -> List[Any]:
+        """Значения эффекта name у всех активных событий"""
+        return [self.catalog[event_id]["effects"][name] for event_id in self._sync()
+                if name in self.catalog.get(event_id, {}).get("effects", {})]
+
+    def roll(self, turn: int) -> Optional[str]:
+        """Выбирает событие за O(1) и запускает его; None, если оно уже идет"""
+        if self._table is None:
+            return None
+        event_id = self._table.sample(random)
+        if self.is_active(event_id):
+            return None
+        self.start(event_id, turn)
+        return event_id
+
+    def start(self, event_id: str, turn: int) -> None:
+        data = self.catalog[event_id]
+        expires = turn + data.get("duration", 1)
+
+        active = dict(self._sync())
+        active[event_id] = expires
+        self._store(active)
+        heapq.heappush(self._expiry_heap, (expires, event_id))
+
+        event_system.dispatch(WorldEventStartedEvent(
+            event_id, data["name"], data.get("news_headline", data["name"]), data.get("effects", {}), expires
+        ))
+
+    def tick(self, turn: int) -> None:
+        """Завершает истекшие события; без истечений - O(1)"""
+        active = self._sync()
+        heap = self._expiry_heap
+        if not heap or heap[0][0] > turn:
+            return
+
+        active = dict(active)
+        ended = []
+        while heap and heap[0][0] <= turn:
+            expires, event_id = heapq.heappop(heap)
+            # Запись кучи устарела, если событие перезапускалось
+            if active.get(event_id) == expires:
+                del active[event_id]
+                ended.append(event_id)
+        self._store(active)
+
+        for event_id in ended:
+            data = self.catalog.get(event_id, {})
+            event_system.dispatch(WorldEventEndedEvent(event_id, data.get("name", event_id), data.get("effects", {})))
+
+
+def handle_world_event_started(event: WorldEventStartedEvent):
+    """Новости и мгновенные эффекты глобального события"""
+    from gameplay.factions import faction_system
+
+    data = event.data
+    effects = data["effects"]
+    print(f"\n{XSSColors.WARNING}📰 {data['headline']}{XSSColors.RESET}")
+
+    prices = effects.get("crypto_prices", {})
+    applied = {}
+    if "multiplier" in prices:
+        variance = prices.get("variance", 0)
+        factors = {}
+        for symbol in crypto_system.crypto_data:
+            factors[symbol] = prices["multiplier"] * random.uniform(1 - variance, 1 + variance)
+            _scale_price(symbol, factors[symbol])
+        applied["prices"] = factors
+    if "volatility_increase" in prices:
+        crypto_system.market_volatility *= prices["volatility_increase"]
+        applied["volatility"] = prices["volatility_increase"]
+    if applied:
+        # Запоминаются, чтобы снять их по окончании события
+        world_events.applied_effects[data["event_id"]] = applied
+
+    heat = effects.get("global_heat_increase", 0) + effects.get("investigation_heat", 0)
+    if heat:
+        current = game_state.get_stat("heat_level", 0)
+        game_state.set_stat("heat_level", max(0, min(GAME_SETTINGS['max_heat_level'], current + heat)))
+        print(f"{XSSColors.DANGER}[!] Heat Level +{heat}%{XSSColors.RESET}")
+
+    for faction_id, change in effects.get("faction_effects", {}).items():
+        faction_system.modify_faction_reputation(faction_id, change.get("bonus", 0) - change.get("penalty", 0))
+    if "whitehats_bonus" in effects:
+        faction_system.modify_faction_reputation("whitehats", effects["whitehats_bonus"])
+
+
+def _scale_price(symbol: str, factor: float) -> None:
+    info = crypto_system.crypto_data.get(symbol)
+    if info is None or factor <= 0:
+        return
+    old_price = info["price"]
+    new_price = old_price * factor
+    info["price"] = new_price
+    change_percent = ((new_price - old_price) / old_price) * 100 if old_price > 0 else 0
+    event_system.dispatch(CryptoMarketChangeEvent(symbol, old_price, new_price, change_percent))
+
+
+def handle_world_event_ended(event: WorldEventEndedEvent):
+    """Снимает эффекты рынка, примененные событием в этом процессе"""
+    applied = world_events.applied_effects.pop(event.data["event_id"], {})
+    for symbol, factor in applied.get("prices", {}).items():
+        _scale_price(symbol, 1 / factor)
+    if "volatility" in applied:
+        crypto_system.market_volatility = max(BASE_VOLATILITY,
+                                              crypto_system.market_volatility / applied["volatility"])
+    print(f"\n{XSSColors.INFO}📰 Событие завершилось: {event.data['name']}{XSSColors.RESET}")
+
+
+def register_world_event_handlers():
+    """Регистрирует обработчики глобальных событий"""
+    event_system.register_listener(WorldEventStartedEvent, handle_world_event_started)
+    event_system.register_listener(WorldEventEndedEvent, handle_world_event_ended)
+
+
+# Движок глобальных событий текущей сессии (см. core/session.py)
+world_events = session_system("world_events", WorldEventEngine)
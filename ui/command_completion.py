@@ -131,6 +131,7 @@ class CommandCompleter:
             # === СИСТЕМА ===
             "save": "Сохранить игру",
             "load": "Загрузить игру",
+            "saves": "Слоты сохранений",
             "help": "Показать справку",
             "exit": "Выйти из игры",
             "quit": "Выйти из игры",
@@ -139,6 +140,7 @@ class CommandCompleter:
 
             # === ТЕСТОВЫЕ И ОТЛАДОЧНЫЕ ===
             "test_event": "Тестировать событие (отладка)",
+            "event_stats": "Метрики событий (отладка)",
             "simulate_mission": "Симулировать миссию (отладка)",
 
             # === АЛИАСЫ И СОКРАЩЕНИЯ ===
@@ -1010,7 +1012,7 @@ class CommandCompleter:
                 "settings", "audio", "music", "sound", "theme",
 
                 # === СИСТЕМА ===
-                "save", "load", "help", "exit", "quit", "debug", "reset",
+                "save", "load", "saves", "help", "exit", "quit", "debug", "reset",
 
                 # === АЛИАСЫ ===
                 "ls", "dir", "cat", "cd", "pwd", "clear", "cls", "man",
@@ -6,6 +6,7 @@ from typing import Dict, Any
 from ui.colors import XSSColors
 from ui.effects import skill_bar, format_currency, format_reputation, progress_bar
 from config.settings import ITEM_CATEGORIES
+from config.game_data import ACHIEVEMENTS
 
 
 def show_status(game_state) -> None:
@@ -103,7 +104,7 @@ def show_status(game_state) -> None:
     # Достижения
     achievements = game_state.get_stat('achievements', [])
     achievements_count = len(achievements)
-    total_achievements = 10  # Временно, нужно получать из системы достижений
+    total_achievements = len(ACHIEVEMENTS)
     
     achievement_percent = int((achievements_count / total_achievements) * 100) if total_achievements > 0 else 0
     if achievement_percent >= 80:
@@ -9,6 +9,9 @@ from typing import Optional
 
 from ui.colors import XSSColors
 from systems.audio import audio_system
+from core.replay import rng_stream
+
+random = rng_stream("effects")
 
 
 def typing_effect(text: str, delay: float = 0.03) -> None:
@@ -173,8 +176,6 @@ def connection_animation() -> None:
 
 def matrix_effect(lines: int = 5, duration: float = 2.0) -> None:
     """Эффект матрицы (упрощенный)"""
-    import random
-    
     chars = "01ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
     start_time = time.time()
     
@@ -187,8 +188,6 @@ def matrix_effect(lines: int = 5, duration: float = 2.0) -> None:
 
 def glitch_effect(text: str, iterations: int = 3) -> None:
     """Эффект глитча текста"""
-    import random
-    
     for _ in range(iterations):
         # Создаем глитчевую версию
         glitched = ""